@@ -0,0 +1,71 @@
+"""Benchmarks for herogold.loops, run with `pytest benchmarks --benchmark-group-by=func`."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+
+import herogold.loops as loops
+from herogold.workers import MetricsRecorder
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+pytest.importorskip("pytest_benchmark")
+
+TINY_ITEMS = 5_000
+PAYLOAD_ITEMS = 32
+PAYLOAD_BYTES = 1 << 20
+ROUNDS = 5
+
+
+def _tiny(value: int) -> int:
+    return value + 1
+
+
+def _payload_length(payload: bytes) -> int:
+    return len(payload)
+
+
+async def _source(count: int) -> AsyncIterator[int]:
+    for value in range(count):
+        await asyncio.sleep(0)
+        yield value
+
+
+@pytest.fixture(scope="module", autouse=True)
+def _warm_pool() -> Iterator[None]:
+    """Start the shared pool before measuring, and shut it down after the module."""
+    list(loops.parallel(_tiny, range(loops.cpu_count)))
+    yield
+    loops.shutdown()
+
+
+def test_parallel_tiny_items(benchmark: BenchmarkFixture) -> None:
+    benchmark.pedantic(lambda: list(loops.parallel(_tiny, range(TINY_ITEMS))), rounds=ROUNDS, warmup_rounds=1)
+
+
+def test_parallel_large_payloads(benchmark: BenchmarkFixture) -> None:
+    payloads = [bytes(PAYLOAD_BYTES)] * PAYLOAD_ITEMS
+    benchmark.pedantic(lambda: list(loops.parallel(_payload_length, payloads)), rounds=ROUNDS, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("max_in_flight", [1, 4, 16], ids=lambda n: f"in_flight={n}")
+@pytest.mark.parametrize("ordered", [True, False], ids=["ordered", "unordered"])
+def test_a_parallel_async_source(benchmark: BenchmarkFixture, max_in_flight: int, *, ordered: bool) -> None:
+    async def run() -> None:
+        async for _ in loops.a_parallel(_tiny, _source(TINY_ITEMS // 10), max_in_flight=max_in_flight, ordered=ordered):
+            pass
+
+    benchmark.pedantic(lambda: asyncio.run(run()), rounds=ROUNDS, warmup_rounds=1)
+
+
+def test_latency_breakdown(benchmark: BenchmarkFixture) -> None:
+    """Run tiny items once more with the `on_task` hook, storing where their time went."""
+    recorder = MetricsRecorder()
+    benchmark.pedantic(lambda: list(loops.parallel(_tiny, range(TINY_ITEMS), on_task=recorder)), rounds=1, iterations=1)
+    benchmark.extra_info.update(recorder.summary())
@@ -0,0 +1,125 @@
+"""Benchmarks for herogold.workers, run with `pytest benchmarks --benchmark-group-by=func`.
+
+Pools are started once per module and size, so only task throughput is measured, not process startup.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+from typing import TYPE_CHECKING
+
+import pytest
+
+from herogold.workers import AsyncWorkerPool, MetricsRecorder, SharedBuffer, WorkerPool
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Iterator
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+pytest.importorskip("pytest_benchmark")
+
+SIZES = [1, 2, 4]
+TINY_TASKS = 2_000
+PAYLOAD_TASKS = 32
+PAYLOAD_BYTES = 1 << 20
+ROUNDS = 5
+
+
+def _tiny(value: int) -> int:
+    return value + 1
+
+
+def _payload_length(payload: bytes) -> int:
+    return len(payload)
+
+
+def _buffer_length(buffer: SharedBuffer) -> int:
+    with buffer.open() as view:
+        return len(view)
+
+
+async def _source(count: int) -> AsyncIterator[int]:
+    for value in range(count):
+        await asyncio.sleep(0)
+        yield value
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"size={size}")
+def pool(request: pytest.FixtureRequest) -> Iterator[WorkerPool]:
+    with WorkerPool(size=request.param) as pool:
+        yield pool
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"size={size}")
+def thread_pool(request: pytest.FixtureRequest) -> Iterator[WorkerPool]:
+    with WorkerPool(size=request.param, backend="thread") as pool:
+        yield pool
+
+
+def _run_all(pool: WorkerPool, actions: list[partial[int]], chunksize: int | None = None) -> None:
+    futures = pool.submit_many(actions, chunksize)
+    pool.wait()
+    for future in futures:
+        future.result()
+
+
+def test_tiny_tasks(benchmark: BenchmarkFixture, pool: WorkerPool) -> None:
+    actions = [partial(_tiny, i) for i in range(TINY_TASKS)]
+    benchmark.pedantic(_run_all, args=(pool, actions), rounds=ROUNDS, warmup_rounds=1)
+
+
+def test_tiny_tasks_unchunked(benchmark: BenchmarkFixture, pool: WorkerPool) -> None:
+    actions = [partial(_tiny, i) for i in range(TINY_TASKS // 10)]
+    benchmark.pedantic(_run_all, args=(pool, actions, 1), rounds=ROUNDS, warmup_rounds=1)
+
+
+def test_tiny_tasks_threads(benchmark: BenchmarkFixture, thread_pool: WorkerPool) -> None:
+    actions = [partial(_tiny, i) for i in range(TINY_TASKS)]
+    benchmark.pedantic(_run_all, args=(thread_pool, actions), rounds=ROUNDS, warmup_rounds=1)
+
+
+def test_large_payloads_pickled(benchmark: BenchmarkFixture, pool: WorkerPool) -> None:
+    payload = bytes(PAYLOAD_BYTES)
+    actions = [partial(_payload_length, payload) for _ in range(PAYLOAD_TASKS)]
+    benchmark.pedantic(_run_all, args=(pool, actions, 1), rounds=ROUNDS, warmup_rounds=1)
+
+
+def test_large_payloads_shared(benchmark: BenchmarkFixture, pool: WorkerPool) -> None:
+    buffer = pool.share(bytes(PAYLOAD_BYTES))
+    actions = [partial(_buffer_length, buffer) for _ in range(PAYLOAD_TASKS)]
+    try:
+        benchmark.pedantic(_run_all, args=(pool, actions, 1), rounds=ROUNDS, warmup_rounds=1)
+    finally:
+        pool.release(buffer)
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"size={size}")
+def async_pool(request: pytest.FixtureRequest) -> Iterator[tuple[asyncio.AbstractEventLoop, AsyncWorkerPool]]:
+    loop = asyncio.new_event_loop()
+    pool = AsyncWorkerPool(size=request.param)
+    loop.run_until_complete(pool.__aenter__())
+    yield loop, pool
+    loop.run_until_complete(pool.aclose())
+    loop.close()
+
+
+async def _feed(pool: AsyncWorkerPool, count: int) -> None:
+    futures = [await pool.submit(partial(_tiny, value)) async for value in _source(count)]
+    await asyncio.gather(*futures)
+
+
+def test_async_source(benchmark: BenchmarkFixture, async_pool: tuple[asyncio.AbstractEventLoop, AsyncWorkerPool]) -> None:
+    loop, pool = async_pool
+    benchmark.pedantic(lambda: loop.run_until_complete(_feed(pool, TINY_TASKS // 10)), rounds=ROUNDS, warmup_rounds=1)
+
+
+@pytest.mark.parametrize("size", SIZES, ids=lambda size: f"size={size}")
+def test_latency_breakdown(benchmark: BenchmarkFixture, size: int) -> None:
+    """Run tiny tasks once more with the `on_task` hook, storing where their time went."""
+    recorder = MetricsRecorder()
+    with WorkerPool(size=size, on_task=recorder) as pool:
+        actions = [partial(_tiny, i) for i in range(TINY_TASKS)]
+        benchmark.pedantic(_run_all, args=(pool, actions), rounds=1, iterations=1)
+    benchmark.extra_info.update(recorder.summary())
@@ -0,0 +1,35 @@
+"""Caches that hold on to values while they are in use."""
+
+from __future__ import annotations
+
+from .decorator import CachedFunction, cached, make_key
+from .descriptor import Cache
+from .disk import DiskCache
+from .policies import EvictionPolicy, LFUPolicy, LRUPolicy, PolicyName, TinyLFUPolicy
+from .shared import SharedCache
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .sizing import estimate_size
+from .stats import CacheStats, StatsLogger
+from .store import Store
+from .tier import Tier
+
+__all__ = [
+    "AsyncSingleFlight",
+    "Cache",
+    "CacheStats",
+    "CachedFunction",
+    "DiskCache",
+    "EvictionPolicy",
+    "LFUPolicy",
+    "LRUPolicy",
+    "PolicyName",
+    "SharedCache",
+    "SingleFlight",
+    "StatsLogger",
+    "Store",
+    "Tier",
+    "TinyLFUPolicy",
+    "cached",
+    "estimate_size",
+    "make_key",
+]
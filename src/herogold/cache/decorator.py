@@ -0,0 +1,159 @@
+"""Memoize the results of sync and async functions."""
+
+from __future__ import annotations
+
+import inspect
+import threading
+from functools import partial, update_wrapper
+from types import MethodType
+from typing import TYPE_CHECKING, Self, cast
+
+from herogold.log import getLogger
+from herogold.sentinel import MISSING
+
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .store import Store
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable, Sequence
+
+    from .policies import PolicyName
+    from .tier import Tier
+
+type KeyFunction = Callable[..., Hashable]
+
+_log = getLogger(__name__)
+
+
+def make_key(*args: object, **kwargs: object) -> Hashable:
+    """Build a cache key from the arguments of a call, keyword arguments being order independent."""
+    if not kwargs:
+        return args
+    return args, tuple(sorted(kwargs.items()))
+
+
+class CachedFunction[**P, R]:
+    """A function wrapped by `cached`, its results are kept in `cache` by the key of their arguments.
+
+    Concurrent misses of one key share a single call of the function.
+    Results that expired less than the store's `stale` seconds ago are returned while a refresh runs in the background.
+    Misses of the store are looked up in the `tiers` in order, before calling the function and storing its result in each.
+    """
+
+    def __init__(
+        self,
+        func: Callable[P, R],
+        store: Store[Hashable, object],
+        key: KeyFunction = make_key,
+        tiers: Sequence[Tier] = (),
+    ) -> None:
+        """Wrap `func`, keeping its results in `store`, and in the `tiers` shared with other processes."""
+        update_wrapper(self, func)
+        self.cache = store
+        self.tiers = tiers
+        self._func = func
+        self._key = key
+        self._is_async = inspect.iscoroutinefunction(func)
+        self._flight: SingleFlight[Hashable, object] = SingleFlight()
+        self._async_flight: AsyncSingleFlight[Hashable, object] = AsyncSingleFlight()
+        if self._is_async:
+            inspect.markcoroutinefunction(self)
+
+    def __get__(self, instance: object, owner: type | None = None) -> Self | MethodType:
+        """Bind to an instance like a regular function does, the instance being part of the key."""
+        return self if instance is None else MethodType(self, instance)
+
+    def __call__(self, *args: P.args, **kwargs: P.kwargs) -> R:
+        """Return the cached result for these arguments, calling the function on a miss."""
+        key = self._key(*args, **kwargs)
+        if self._is_async:
+            return cast("R", self._call_async(key, *args, **kwargs))
+        load = partial(self._load, key, *args, **kwargs)
+        if (found := self.cache.lookup(key)) is None:
+            return cast("R", self._flight.do(key, load))
+        value, fresh = found
+        if not fresh and key not in self._flight:
+            threading.Thread(target=self._refresh, args=(key, load), name="cached-refresh", daemon=True).start()
+        return cast("R", value)
+
+    def _load(self, key: Hashable, *args: P.args, **kwargs: P.kwargs) -> object:
+        value = self._from_tiers(key)
+        if value is MISSING:
+            value = self._func(*args, **kwargs)
+            self._to_tiers(key, value)
+        self.cache.set(key, value)
+        return value
+
+    def _tier_key(self, key: Hashable) -> Hashable:
+        """Namespace a key by the function, since tiers are shared by every function using them."""
+        return self.__module__, self.__qualname__, key
+
+    def _from_tiers(self, key: Hashable) -> object:
+        tier_key = self._tier_key(key)
+        for tier in self.tiers:
+            if (value := tier.get(tier_key)) is not MISSING:
+                return value
+        return MISSING
+
+    def _to_tiers(self, key: Hashable, value: object) -> None:
+        tier_key = self._tier_key(key)
+        for tier in self.tiers:
+            tier.set(tier_key, value, self.cache.ttl)
+
+    def _refresh(self, key: Hashable, load: Callable[[], object]) -> None:
+        """Reload a stale result in the background, keeping the stale one when that fails."""
+        try:
+            self._flight.do(key, load)
+        except Exception:  # noqa: BLE001 # Nobody is waiting on the refresh to raise to.
+            _log.exception("Refreshing the cached result of %s failed.", self._func)
+
+    async def _call_async(self, key: Hashable, *args: P.args, **kwargs: P.kwargs) -> object:
+        load = partial(self._load_async, key, *args, **kwargs)
+        if (found := self.cache.lookup(key)) is None:
+            return await self._async_flight.do(key, load)
+        value, fresh = found
+        if not fresh:
+            self._async_flight.start(key, load)
+        return value
+
+    async def _load_async(self, key: Hashable, *args: P.args, **kwargs: P.kwargs) -> object:
+        value = self._from_tiers(key)
+        if value is MISSING:
+            value = await cast("Awaitable[object]", self._func(*args, **kwargs))
+            self._to_tiers(key, value)
+        self.cache.set(key, value)
+        return value
+
+    def cache_info(self) -> dict[str, float]:
+        """Return the statistics of the cache, and its current size."""
+        return {**self.cache.stats.snapshot(), "size": len(self.cache)}
+
+    def cache_clear(self) -> None:
+        """Forget every cached result."""
+        self.cache.clear()
+
+
+def cached[**P, R](  # noqa: PLR0913
+    *,
+    ttl: float | None = None,
+    maxsize: int | None = 128,
+    policy: PolicyName = "lru",
+    key: KeyFunction = make_key,
+    sweep_interval: float | None = None,
+    stale: float = 0.0,
+    tiers: Sequence[Tier] = (),
+) -> Callable[[Callable[P, R]], CachedFunction[P, R]]:
+    """Memoize a sync or async function, keeping up to `maxsize` results for `ttl` seconds.
+
+    Results are stored under `key(*args, **kwargs)`, by default the arguments themselves, so they must be hashable.
+    Async functions cache the awaited result, exceptions are never cached.
+    Without a `ttl` results never expire, with `maxsize=None` the cache is unbounded.
+    Expired results keep being served for up to `stale` more seconds, while they are refreshed in the background.
+    Results are also kept in the given `tiers`, like a `SharedCache` so worker processes reuse each other's results.
+    """
+
+    def decorator(func: Callable[P, R]) -> CachedFunction[P, R]:
+        store: Store[Hashable, object] = Store(maxsize, policy=policy, ttl=ttl, sweep_interval=sweep_interval, stale=stale)
+        return CachedFunction(func, store, key, tiers)
+
+    return decorator
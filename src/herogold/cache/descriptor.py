@@ -0,0 +1,140 @@
+"""A simple cache implementation that uses weak references to allow values to be garbage collected when they are no longer in use."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+from weakref import KeyedRef, ref
+
+from herogold.errors import with_known_exception
+from herogold.protocols import Container
+
+from .policies import EvictionPolicy, PolicyName, get_policy
+from .sizing import estimate_size
+from .stats import CacheStats, StatsLogger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class Cache[K, V](Container[K, V]):
+    """A simple cache implementation that uses weak references to allow values to be garbage collected when they are no longer in use."""
+
+    def __init__(
+        self,
+        cache: dict[K, ref[V]] | None = None,
+        *,
+        maxsize: int | None = None,
+        policy: PolicyName | EvictionPolicy[K] = "lru",
+        weigher: Callable[[V], int] | None = None,
+        hot: int = 0,
+    ) -> None:
+        """Initialize the cache, storing its entries in `cache` when given.
+
+        With a `maxsize` the cache is bounded, once full the `policy` picks the keys to evict.
+        Every entry counts as one towards `maxsize`, unless a `weigher` gives its weight,
+        like `estimate_size` to bound the cache by the estimated bytes of its values.
+
+        Entries are removed once their value is garbage collected, in batches on the next access of the cache.
+        A `hot` set keeps strong references to that many of the most recently read values,
+        so values that are used over and over aren't collected in between uses.
+
+        Hits, misses, evictions and entries lost to garbage collection are counted in `stats`.
+        """
+        self.stats = CacheStats()
+        self._cache = {} if cache is None else cache
+        self._weigher = weigher
+        self._hot_size = hot
+        self._hot: OrderedDict[K, V] = OrderedDict()
+        self._dead: list[KeyedRef[K, V]] = []
+        """References whose value was collected, appended by their callback and purged on the next access."""
+        self_ref = ref(self)
+
+        def collected(entry: KeyedRef[K, V]) -> None:
+            # Runs wherever the garbage collector happens to run, so the cache itself is only changed later.
+            if (cache := self_ref()) is not None:
+                cache._dead.append(entry)  # noqa: SLF001
+
+        self._collected = collected
+        self._policy: EvictionPolicy[K] | None = None
+        if isinstance(policy, EvictionPolicy):
+            self._policy = policy
+        elif maxsize is not None:
+            self._policy = get_policy(policy, maxsize)
+        for key, entry in list(self._cache.items()):
+            if (value := entry()) is None:
+                del self._cache[key]
+            else:
+                self._cache[key] = KeyedRef(value, self._collected, key)
+                self._track(key, value)
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        self.purge()
+        return len(self._cache)
+
+    def purge(self) -> None:
+        """Remove the entries whose values were garbage collected since the last access."""
+        while self._dead:
+            entry = self._dead.pop()
+            if self._cache.get(entry.key) is entry:  # The key may have been set to a new value since.
+                self._discard(entry.key)
+                self.stats.collected += 1
+
+    @with_known_exception(AttributeError)
+    def __get__(self, instance: K, owner: type[K]) -> V | None:
+        """Get a value from the cache."""
+        self.purge()
+        entry = self._cache.get(instance)
+        value = None if entry is None else entry()
+        if value is None:
+            if entry is not None:  # The value has been garbage collected, but the entry not purged yet.
+                self._discard(instance)
+                self.stats.collected += 1
+            self.stats.misses += 1
+            msg = f"{instance} not found in cache"
+            raise AttributeError(msg)
+        self.stats.hits += 1
+        if self._policy is not None:
+            self._policy.access(instance)
+        if self._hot_size:
+            self._hot[instance] = value
+            self._hot.move_to_end(instance)
+            if len(self._hot) > self._hot_size:
+                self._hot.popitem(last=False)
+        return value
+
+    def __set__(self, instance: K, value: V) -> None:
+        """Set a value in the cache."""
+        self.purge()
+        self._cache[instance] = KeyedRef(value, self._collected, instance)
+        self._hot.pop(instance, None)
+        self._track(instance, value)
+
+    def _track(self, key: K, value: V) -> None:
+        """Let the eviction policy know about a new entry, evicting the keys it picks."""
+        if self._policy is None:
+            return
+        for evicted in self._policy.add(key, 1 if self._weigher is None else self._weigher(value)):
+            self._cache.pop(evicted, None)
+            self._hot.pop(evicted, None)
+            self.stats.evictions += 1
+
+    def _discard(self, key: K) -> None:
+        """Remove an entry from the cache and its eviction policy."""
+        self._cache.pop(key, None)
+        self._hot.pop(key, None)
+        if self._policy is not None:
+            self._policy.remove(key)
+
+    def memory(self) -> int:
+        """Return the estimated bytes held by the values that are still alive."""
+        self.purge()
+        return sum(estimate_size(value) for entry in list(self._cache.values()) if (value := entry()) is not None)
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the statistics of the cache, its current size and estimated memory as a plain dict."""
+        return {**self.stats.snapshot(), "size": len(self), "memory": self.memory()}
+
+    def log_stats(self, interval: float, *, name: str = "cache") -> StatsLogger:
+        """Start logging a snapshot every `interval` seconds, until the returned logger is stopped."""
+        return StatsLogger(self.snapshot, interval, name=name).start()
@@ -0,0 +1,263 @@
+"""A persistent cache tier: an append-only log on disk, read through `mmap` with an in-memory index of its keys."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from herogold.sentinel import MISSING
+
+from .serialization import dump_key, dumps, loads
+from .stats import CacheStats
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows.
+    fcntl = None
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator, Hashable
+    from types import TracebackType
+
+_FILE_HEADER = struct.Struct("<4sI")
+"""Magic and format version."""
+_MAGIC = b"HGDC"
+_FORMAT = 1
+_RECORD = struct.Struct("<IIId")
+"""Checksum of the rest of the record, key length, value length and expiry as `time.time`, followed by the key and value."""
+_TOMBSTONE = 0xFFFFFFFF
+"""Value length of a record deleting its key."""
+
+type _Location = tuple[int, int, float]
+"""Offset and length of a value in the log, and its expiry."""
+
+
+def _encode(key: bytes, value: bytes | None, expires: float) -> bytes:
+    value_length = _TOMBSTONE if value is None else len(value)
+    body = _RECORD.pack(0, len(key), value_length, expires)[4:] + key + (value or b"")
+    return struct.pack("<I", zlib.crc32(body)) + body
+
+
+class DiskCache:
+    """A cache kept in an append-only log file, so it survives restarts and can grow beyond memory.
+
+    Only the keys and the location of their latest value are kept in memory, values are read from the file through `mmap`.
+    Every write appends a record, `compact` rewrites the log without overwritten, deleted and expired records.
+    Records torn by a crash are detected by their checksum and cut off when the file is opened.
+
+    Several processes can use the same file, appends are serialized with `fcntl` locks where available,
+    and each process picks up records appended by others on its next miss.
+    The cache is picklable, unpickling opens the same file, so it can be passed to pool workers.
+    Values are unpickled when they aren't builtin types, so only use files written by trusted processes.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], *, sync: bool = False) -> None:
+        """Open the log at `path`, creating it when it doesn't exist yet.
+
+        With `sync` every write is flushed to disk before returning, surviving power loss at the cost of speed.
+        """
+        self.path = Path(path)
+        self.sync = sync
+        self.stats = CacheStats()
+        self._lock = threading.RLock()
+        self._index: dict[bytes, _Location] = {}
+        self._garbage = 0
+        """Bytes of records that were overwritten or deleted since the log was compacted."""
+        self._open()
+
+    def _open(self) -> None:
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_APPEND, 0o600)
+        self._map: mmap.mmap | None = None
+        self._index.clear()
+        self._garbage = 0
+        try:
+            with self._locked():
+                if os.fstat(self._fd).st_size == 0:
+                    os.write(self._fd, _FILE_HEADER.pack(_MAGIC, _FORMAT))
+                self._remap()
+                self._check_header()
+                self._scanned = _FILE_HEADER.size
+                self._scan()
+                if self._scanned < os.fstat(self._fd).st_size:  # A torn record of a write that crashed.
+                    os.ftruncate(self._fd, self._scanned)
+                    self._remap()
+        except BaseException:
+            self.close()
+            raise
+
+    def _check_header(self) -> None:
+        if self._mapped(0, _FILE_HEADER.size) != _FILE_HEADER.pack(_MAGIC, _FORMAT):
+            msg = f"{self.path} is not a disk cache file."
+            raise ValueError(msg)
+
+    def __reduce__(self) -> tuple[Callable[[Path], Self], tuple[Path]]:
+        """Pickle as the path of the file, so unpickling opens it."""
+        return partial(type(self), sync=self.sync), (self.path,)
+
+    def __enter__(self) -> Self:
+        """Context manager entry."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Context manager exit — close on exit."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Return the number of keys, including expired ones that haven't been compacted away."""
+        return len(self._index)
+
+    def close(self) -> None:
+        """Close the file, everything written so far stays on disk."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            if self._fd != -1:
+                os.close(self._fd)
+                self._fd = -1
+
+    @contextmanager
+    def _locked(self) -> Generator[None]:
+        """Hold an exclusive lock on the file, keeping other processes from appending."""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            fcntl.lockf(self._fd, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN)
+
+    def _remap(self) -> None:
+        """Map the whole file again after it grew."""
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._fd, 0, access=mmap.ACCESS_READ)
+
+    def _data(self) -> mmap.mmap:
+        if self._map is None:
+            msg = f"{self.path} is closed."
+            raise ValueError(msg)
+        return self._map
+
+    def _mapped(self, start: int, length: int) -> bytes:
+        if start + length > len(self._data()):
+            self._remap()
+        return self._data()[start : start + length]
+
+    def _scan(self) -> None:
+        """Index the records appended since the last scan, stopping at the first incomplete one."""
+        data = self._data()
+        offset = self._scanned
+        while offset + _RECORD.size <= len(data):
+            checksum, key_length, value_length, expires = _RECORD.unpack_from(data, offset)
+            stored = 0 if value_length == _TOMBSTONE else value_length
+            end = offset + _RECORD.size + key_length + stored
+            if end > len(data) or zlib.crc32(data[offset + 4 : end]) != checksum:
+                break
+            key = data[offset + _RECORD.size : offset + _RECORD.size + key_length]
+            location = None if value_length == _TOMBSTONE else (offset + _RECORD.size + key_length, value_length, expires)
+            self._index_record(key, location, end - offset)
+            offset = end
+        self._scanned = offset
+
+    def _index_record(self, key: bytes, location: _Location | None, size: int) -> None:
+        previous = self._index.pop(key, None) if location is None else self._index.get(key)
+        if previous is not None:
+            self._garbage += _RECORD.size + len(key) + previous[1]
+        if location is None:
+            self._garbage += size
+        else:
+            self._index[key] = location
+
+    def _catch_up(self) -> bool:
+        """Index records appended by other processes, returning whether there were any."""
+        if os.fstat(self._fd).st_size <= self._scanned:
+            return False
+        self._remap()
+        self._scan()
+        return True
+
+    def get(self, key: Hashable, default: object = MISSING) -> object:
+        """Return the value of the key, or `default` when it is missing or expired."""
+        key_bytes = dump_key(key)
+        with self._lock:
+            location = self._index.get(key_bytes)
+            if location is None and self._catch_up():
+                location = self._index.get(key_bytes)
+            if location is None or (location[2] and location[2] <= time.time()):
+                self.stats.misses += 1
+                return default
+            offset, length, _ = location
+            value = self._mapped(offset, length)
+        self.stats.hits += 1
+        return loads(value)
+
+    def set(self, key: Hashable, value: object, ttl: float | None = None) -> bool:
+        """Append a value for `ttl` seconds or forever, always returning True."""
+        self._append(dump_key(key), dumps(value), 0.0 if ttl is None else time.time() + ttl)
+        return True
+
+    def delete(self, key: Hashable) -> bool:
+        """Append a deletion of the key, returning whether it was stored."""
+        key_bytes = dump_key(key)
+        with self._lock:
+            self._catch_up()
+            if key_bytes not in self._index:
+                return False
+            self._append(key_bytes, None, 0.0)
+            return True
+
+    def _append(self, key: bytes, value: bytes | None, expires: float) -> None:
+        record = _encode(key, value, expires)
+        with self._locked():
+            self._catch_up()
+            offset = os.fstat(self._fd).st_size
+            written = 0
+            while written < len(record):
+                written += os.write(self._fd, record[written:])
+            if self.sync:
+                os.fsync(self._fd)
+            location = None if value is None else (offset + _RECORD.size + len(key), len(value), expires)
+            self._index_record(key, location, len(record))
+            self._scanned = offset + len(record)
+
+    def compact(self) -> None:
+        """Rewrite the log with only the latest unexpired value of every key.
+
+        The file is replaced, so other processes must not have it open while compacting.
+        """
+        now = time.time()
+        temporary = self.path.with_name(f"{self.path.name}.compact")
+        with self._locked():
+            self._catch_up()
+            with temporary.open("wb") as file:
+                file.write(_FILE_HEADER.pack(_MAGIC, _FORMAT))
+                for key, (offset, length, expires) in self._index.items():
+                    if not expires or expires > now:
+                        file.write(_encode(key, self._mapped(offset, length), expires))
+                file.flush()
+                os.fsync(file.fileno())
+            temporary.replace(self.path)
+            self.close()
+            self._open()
+
+    @property
+    def garbage_ratio(self) -> float:
+        """Return the fraction of the file taken by records that `compact` would drop, ignoring expiry."""
+        size = self._scanned - _FILE_HEADER.size
+        return self._garbage / size if size > 0 else 0.0
@@ -0,0 +1,332 @@
+"""Eviction policies deciding which keys a bounded cache drops once it is full."""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from typing import Literal
+
+type PolicyName = Literal["lru", "lfu", "tinylfu"]
+"""Which keys are evicted first.
+
+- `lru`: the least recently used key.
+- `lfu`: the least frequently used key, the least recently used among equally frequent ones.
+- `tinylfu`: W-TinyLFU, new keys pass a small LRU window and then only displace keys that are used less often.
+"""
+
+
+class EvictionPolicy[K](ABC):
+    """Tracks the keys of a cache and their weights, picking keys to evict once they outweigh `maxsize`."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the policy for a cache holding at most `maxsize` worth of entries."""
+        if maxsize < 1:
+            msg = f"maxsize must be at least 1, got {maxsize}"
+            raise ValueError(msg)
+        self.maxsize = maxsize
+        self.weight = 0
+
+    @abstractmethod
+    def __contains__(self, key: object) -> bool:
+        """Return whether the key is tracked."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+
+    @abstractmethod
+    def access(self, key: K) -> None:
+        """Record a hit on a cached key."""
+
+    def add(self, key: K, weight: int = 1) -> list[K]:
+        """Track a new or updated key, returning the keys to evict to make room, which may include `key` itself."""
+        self.remove(key)
+        if weight > self.maxsize:
+            return [key]
+        evicted: list[K] = []
+        while self.weight + weight > self.maxsize:
+            victim = self._victim()
+            self.remove(victim)
+            evicted.append(victim)
+        self._insert(key, weight)
+        self.weight += weight
+        return evicted
+
+    def remove(self, key: K) -> None:
+        """Stop tracking a key that was removed from the cache."""
+        if (weight := self._forget(key)) is not None:
+            self.weight -= weight
+
+    def clear(self) -> None:
+        """Stop tracking every key."""
+        for key in list(self._keys()):
+            self.remove(key)
+
+    @abstractmethod
+    def _keys(self) -> list[K]:
+        """Return every tracked key."""
+
+    @abstractmethod
+    def _insert(self, key: K, weight: int) -> None:
+        """Start tracking a key that isn't tracked yet."""
+
+    @abstractmethod
+    def _forget(self, key: K) -> int | None:
+        """Stop tracking a key, returning its weight, or None when it wasn't tracked."""
+
+    @abstractmethod
+    def _victim(self) -> K:
+        """Return the key to evict next, only called while keys are tracked."""
+
+
+class LRUPolicy[K](EvictionPolicy[K]):
+    """Evicts the least recently used key."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the policy for a cache holding at most `maxsize` worth of entries."""
+        super().__init__(maxsize)
+        self._order: OrderedDict[K, int] = OrderedDict()
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether the key is tracked."""
+        return key in self._order
+
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+        return len(self._order)
+
+    def access(self, key: K) -> None:
+        """Mark the key as the most recently used."""
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def _keys(self) -> list[K]:
+        return list(self._order)
+
+    def _insert(self, key: K, weight: int) -> None:
+        self._order[key] = weight
+
+    def _forget(self, key: K) -> int | None:
+        return self._order.pop(key, None)
+
+    def _victim(self) -> K:
+        return next(iter(self._order))
+
+
+class LFUPolicy[K](EvictionPolicy[K]):
+    """Evicts the least frequently used key, keeping keys in buckets per use count for constant time updates."""
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the policy for a cache holding at most `maxsize` worth of entries."""
+        super().__init__(maxsize)
+        self._counts: dict[K, tuple[int, int]] = {}
+        """The use count and weight of every key."""
+        self._buckets: defaultdict[int, dict[K, None]] = defaultdict(dict)
+        """Keys per use count, in order of their last use."""
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether the key is tracked."""
+        return key in self._counts
+
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+        return len(self._counts)
+
+    def access(self, key: K) -> None:
+        """Count a use of the key."""
+        if key not in self._counts:
+            return
+        count, weight = self._counts[key]
+        self._unbucket(key, count)
+        self._counts[key] = (count + 1, weight)
+        self._buckets[count + 1][key] = None
+
+    def _unbucket(self, key: K, count: int) -> None:
+        bucket = self._buckets[count]
+        del bucket[key]
+        if not bucket:
+            del self._buckets[count]
+
+    def _keys(self) -> list[K]:
+        return list(self._counts)
+
+    def _insert(self, key: K, weight: int) -> None:
+        self._counts[key] = (1, weight)
+        self._buckets[1][key] = None
+
+    def _forget(self, key: K) -> int | None:
+        if (entry := self._counts.pop(key, None)) is None:
+            return None
+        count, weight = entry
+        self._unbucket(key, count)
+        return weight
+
+    def _victim(self) -> K:
+        return next(iter(self._buckets[min(self._buckets)]))
+
+
+class FrequencySketch:
+    """A count-min sketch estimating how often keys were seen, with small saturating counters.
+
+    Every counter is halved once as many keys were counted as ten times the capacity,
+    so keys that used to be popular fade out.
+    """
+
+    _SEEDS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9, 0x27D4EB2F165667C5)
+    _MAX_COUNT = 15
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize a sketch sized for a cache of `capacity` keys."""
+        width = 1 << max(4, (capacity - 1).bit_length())
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in self._SEEDS]
+        self._additions = 0
+        self._sample_size = 10 * capacity
+
+    def _indexes(self, key: object) -> list[int]:
+        spread = hash(key) & 0xFFFFFFFFFFFFFFFF
+        return [((spread * seed) & 0xFFFFFFFFFFFFFFFF) >> 32 & self._mask for seed in self._SEEDS]
+
+    def increment(self, key: object) -> None:
+        """Count one occurrence of the key."""
+        for row, index in zip(self._rows, self._indexes(key), strict=True):
+            if row[index] < self._MAX_COUNT:
+                row[index] += 1
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def frequency(self, key: object) -> int:
+        """Return the estimated number of occurrences of the key."""
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key), strict=True))
+
+    def _age(self) -> None:
+        """Halve every counter."""
+        self._rows = [bytearray(count >> 1 for count in row) for row in self._rows]
+        self._additions //= 2
+
+
+class TinyLFUPolicy[K](EvictionPolicy[K]):
+    """W-TinyLFU: new keys enter a small LRU window, and only stay when used more often than the main cache's victim.
+
+    The main cache is a segmented LRU, keys used again while on probation are promoted to a protected segment.
+    This keeps one-hit wonders from flushing keys that are used over and over.
+    """
+
+    window_fraction = 0.01
+    protected_fraction = 0.8
+
+    def __init__(self, maxsize: int) -> None:
+        """Initialize the policy for a cache holding at most `maxsize` worth of entries."""
+        super().__init__(maxsize)
+        self._window_max = max(1, round(maxsize * self.window_fraction))
+        self._main_max = maxsize - self._window_max
+        self._protected_max = int(self._main_max * self.protected_fraction)
+        self._window: OrderedDict[K, int] = OrderedDict()
+        self._probation: OrderedDict[K, int] = OrderedDict()
+        self._protected: OrderedDict[K, int] = OrderedDict()
+        self._window_weight = 0
+        self._protected_weight = 0
+        self._sketch = FrequencySketch(maxsize)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether the key is tracked."""
+        return key in self._window or key in self._probation or key in self._protected
+
+    def __len__(self) -> int:
+        """Return the number of tracked keys."""
+        return len(self._window) + len(self._probation) + len(self._protected)
+
+    def access(self, key: K) -> None:
+        """Count a use of the key, promoting it to the protected segment when it was on probation."""
+        self._sketch.increment(key)
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            weight = self._probation.pop(key)
+            self._protected[key] = weight
+            self._protected_weight += weight
+            while self._protected_weight > self._protected_max:
+                demoted, demoted_weight = self._protected.popitem(last=False)
+                self._protected_weight -= demoted_weight
+                self._probation[demoted] = demoted_weight
+
+    def add(self, key: K, weight: int = 1) -> list[K]:
+        """Put the key in the window, moving keys that overflow it to the main cache if they win admission."""
+        self.remove(key)
+        self._sketch.increment(key)
+        if weight > self.maxsize:
+            return [key]
+        self._insert(key, weight)
+        self.weight += weight
+        evicted: list[K] = []
+        while self._window_weight > self._window_max and len(self._window) > 1:
+            candidate, candidate_weight = self._window.popitem(last=False)
+            self._window_weight -= candidate_weight
+            self.weight -= candidate_weight
+            evicted.extend(self._admit(candidate, candidate_weight))
+        while self.weight > self.maxsize:  # A single heavy key can overflow the window on its own.
+            victim = self._victim()
+            self.remove(victim)
+            evicted.append(victim)
+        return evicted
+
+    def _main_victim(self) -> K | None:
+        """Return the key the main cache evicts next, if it holds any."""
+        return next(iter(self._probation or self._protected), None)
+
+    def _fits_main(self, weight: int) -> bool:
+        return self.weight - self._window_weight + weight <= self._main_max
+
+    def _admit(self, candidate: K, weight: int) -> list[K]:
+        """Move a key from the window to probation, returning the evicted keys.
+
+        When the main cache is full the candidate has to be used more often than the main cache's victim,
+        otherwise the candidate itself is evicted.
+        """
+        if weight > self._main_max:
+            return [candidate]
+        if not self._fits_main(weight):
+            victim = self._main_victim()
+            if victim is None or self._sketch.frequency(candidate) <= self._sketch.frequency(victim):
+                return [candidate]
+        evicted: list[K] = []
+        while not self._fits_main(weight) and (victim := self._main_victim()) is not None:
+            self.remove(victim)
+            evicted.append(victim)
+        self._probation[candidate] = weight
+        self.weight += weight
+        return evicted
+
+    def _keys(self) -> list[K]:
+        return [*self._window, *self._probation, *self._protected]
+
+    def _insert(self, key: K, weight: int) -> None:
+        self._window[key] = weight
+        self._window_weight += weight
+
+    def _forget(self, key: K) -> int | None:
+        if (weight := self._window.pop(key, None)) is not None:
+            self._window_weight -= weight
+            return weight
+        if (weight := self._protected.pop(key, None)) is not None:
+            self._protected_weight -= weight
+            return weight
+        return self._probation.pop(key, None)
+
+    def _victim(self) -> K:
+        victim = self._main_victim()
+        return next(iter(self._window)) if victim is None else victim
+
+
+def get_policy[K](name: PolicyName, maxsize: int) -> EvictionPolicy[K]:
+    """Return a new eviction policy with the given name."""
+    match name:
+        case "lru":
+            return LRUPolicy(maxsize)
+        case "lfu":
+            return LFUPolicy(maxsize)
+        case "tinylfu":
+            return TinyLFUPolicy(maxsize)
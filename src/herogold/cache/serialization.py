@@ -0,0 +1,40 @@
+"""Compact serialization of cached keys and values, for the tiers shared across processes and restarts."""
+
+from __future__ import annotations
+
+import hashlib
+import marshal
+import pickle
+
+_MARSHAL = b"m"
+_PICKLE = b"p"
+_KEY_VERSION = 2
+"""Marshal version for keys, later versions share repeated objects by reference, so equal keys could differ in bytes."""
+
+
+def dumps(value: object) -> bytes:
+    """Serialize a value, using `marshal` for builtin types and falling back on `pickle` for anything else."""
+    try:
+        return _MARSHAL + marshal.dumps(value)
+    except ValueError:
+        return _PICKLE + pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def dump_key(key: object) -> bytes:
+    """Serialize a key, equal keys of builtin types always giving equal bytes."""
+    try:
+        return _MARSHAL + marshal.dumps(key, _KEY_VERSION)
+    except ValueError:
+        return _PICKLE + pickle.dumps(key, pickle.HIGHEST_PROTOCOL)
+
+
+def loads(data: bytes) -> object:
+    """Deserialize a value written by `dumps` or `dump_key`, only use on data written by a trusted process."""
+    if data[:1] == _MARSHAL:
+        return marshal.loads(data[1:])  # noqa: S302
+    return pickle.loads(data[1:])  # noqa: S301
+
+
+def key_hash(key: bytes) -> int:
+    """Return a 64 bit hash of a serialized key, stable across processes unlike `hash`."""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little")
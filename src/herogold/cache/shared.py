@@ -0,0 +1,247 @@
+"""A cache tier in a memory-mapped file, shared by every process that opens it."""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Self
+
+from herogold.sentinel import MISSING
+
+from .serialization import dump_key, dumps, key_hash, loads
+from .stats import CacheStats
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows.
+    fcntl = None
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Hashable
+    from types import TracebackType
+
+_HEADER = struct.Struct("<4sIIII")
+"""Magic, format version, number of slots, bytes per slot and slots per bucket."""
+_HEADER_SIZE = 64
+_MAGIC = b"HGSC"
+_FORMAT = 1
+_SLOT = struct.Struct("<QQddII")
+"""Sequence number, key hash, expiry and write time as `time.time`, key length and value length."""
+_SEQUENCE = struct.Struct("<Q")
+_READ_RETRIES = 16
+
+
+def _check_layout(slots: int, slot_size: int, ways: int) -> None:
+    if ways < 1 or slots < ways or slots % ways or slot_size <= _SLOT.size:
+        msg = f"slots must be a multiple of ways, and slot_size larger than {_SLOT.size}, got {slots}, {ways}, {slot_size}"
+        raise ValueError(msg)
+
+
+def _default_directory() -> Path:
+    """Return a directory backed by memory where available, so the file never has to reach the disk."""
+    shm = Path("/dev/shm")  # noqa: S108
+    return shm if shm.is_dir() else Path(tempfile.gettempdir())
+
+
+class SharedCache:
+    """A fixed-size hash table in a memory-mapped file, holding serialized keys and values for many processes.
+
+    Keys hash to a bucket of `ways` slots, a full bucket overwrites its expired or oldest slot.
+    Reads take no lock: every slot has a sequence number that is odd while it is written,
+    and a read is retried when the number changed while copying the slot.
+    Writes lock their bucket with `fcntl`, on platforms without it only a single process should write.
+
+    The cache is picklable, unpickling attaches to the same file, so it can be passed to pool workers.
+    Values are unpickled when they aren't builtin types, so only share the file with trusted processes.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        *,
+        slots: int = 4096,
+        slot_size: int = 1024,
+        ways: int = 8,
+    ) -> None:
+        """Open the cache file at `path`, creating it with the given layout when it doesn't exist yet.
+
+        Without a path a new file is created in shared memory, delete it with `unlink` once done.
+        Entries whose serialized key and value don't fit in a `slot_size` bytes slot are not stored.
+        """
+        self.path = Path(path) if path is not None else _default_directory() / f"herogold-cache-{uuid.uuid4().hex}"
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            with self._locked(0, 0):  # Keeps other processes from reading the header before it is written.
+                created = os.fstat(self._fd).st_size == 0
+                if created:
+                    _check_layout(slots, slot_size, ways)
+                    os.ftruncate(self._fd, _HEADER_SIZE + slots * slot_size)
+                self._map = mmap.mmap(self._fd, 0)
+                if created:
+                    _HEADER.pack_into(self._map, 0, _MAGIC, _FORMAT, slots, slot_size, ways)
+        except BaseException:
+            os.close(self._fd)
+            raise
+        magic, version, self.slots, self.slot_size, self.ways = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _FORMAT:
+            self.close()
+            msg = f"{self.path} is not a shared cache file."
+            raise ValueError(msg)
+        self._buckets = self.slots // self.ways
+
+    def __reduce__(self) -> tuple[type[Self], tuple[Path]]:
+        """Pickle as the path of the file, so unpickling attaches to it."""
+        return type(self), (self.path,)
+
+    def __enter__(self) -> Self:
+        """Context manager entry."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Context manager exit — close on exit."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap the file, the entries stay available to other processes."""
+        if not self._map.closed:
+            self._map.close()
+            os.close(self._fd)
+
+    def unlink(self) -> None:
+        """Close and delete the file, processes that still have it open keep their mapping."""
+        self.close()
+        self.path.unlink(missing_ok=True)
+
+    @contextmanager
+    def _locked(self, start: int, length: int) -> Generator[None]:
+        """Hold an exclusive lock on a byte range of the file, or on the whole file with a length of 0."""
+        if fcntl is None:
+            yield
+            return
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+    def _offset(self, slot: int) -> int:
+        return _HEADER_SIZE + slot * self.slot_size
+
+    def _bucket(self, hashed: int) -> range:
+        first = (hashed % self._buckets) * self.ways
+        return range(first, first + self.ways)
+
+    def _read(self, slot: int, hashed: int) -> tuple[float, bytes, bytes] | None:
+        """Return the expiry, key and value of a slot holding a key with this hash, retrying torn reads."""
+        offset = self._offset(slot)
+        for _ in range(_READ_RETRIES):
+            sequence, slot_hash, expires, _, key_length, value_length = _SLOT.unpack_from(self._map, offset)
+            if slot_hash != hashed or not key_length:
+                return None
+            if sequence & 1 or key_length + value_length > self.slot_size - _SLOT.size:
+                time.sleep(0)
+                continue
+            start = offset + _SLOT.size
+            data = self._map[start : start + key_length + value_length]
+            if _SEQUENCE.unpack_from(self._map, offset)[0] == sequence:
+                return expires, data[:key_length], data[key_length:]
+        return None
+
+    def get(self, key: Hashable, default: object = MISSING) -> object:
+        """Return the value of the key, or `default` when it is missing or expired."""
+        key_bytes = dump_key(key)
+        hashed = key_hash(key_bytes)
+        for slot in self._bucket(hashed):
+            found = self._read(slot, hashed)
+            if found is None:
+                continue
+            expires, slot_key, value = found
+            if slot_key == key_bytes and (not expires or expires > time.time()):
+                self.stats.hits += 1
+                return loads(value)
+        self.stats.misses += 1
+        return default
+
+    def set(self, key: Hashable, value: object, ttl: float | None = None) -> bool:
+        """Store a value for `ttl` seconds or forever, returning whether it was small enough to fit in a slot."""
+        key_bytes, value_bytes = dump_key(key), dumps(value)
+        if len(key_bytes) + len(value_bytes) > self.slot_size - _SLOT.size:
+            return False
+        hashed = key_hash(key_bytes)
+        bucket = self._bucket(hashed)
+        now = time.time()
+        with self._lock, self._locked(self._offset(bucket.start), self.ways * self.slot_size):
+            slot = self._pick_slot(bucket, hashed, key_bytes, now)
+            offset = self._offset(slot)
+            sequence = _SEQUENCE.unpack_from(self._map, offset)[0]
+            if self._occupied(offset) and not self._holds(offset, hashed, key_bytes):
+                self.stats.evictions += 1
+            _SEQUENCE.pack_into(self._map, offset, sequence + 1)
+            start = offset + _SLOT.size
+            self._map[start : start + len(key_bytes) + len(value_bytes)] = key_bytes + value_bytes
+            expires = 0.0 if ttl is None else now + ttl
+            _SLOT.pack_into(self._map, offset, sequence + 2, hashed, expires, now, len(key_bytes), len(value_bytes))
+        return True
+
+    def delete(self, key: Hashable) -> bool:
+        """Remove a key, returning whether it was stored."""
+        key_bytes = dump_key(key)
+        hashed = key_hash(key_bytes)
+        bucket = self._bucket(hashed)
+        with self._lock, self._locked(self._offset(bucket.start), self.ways * self.slot_size):
+            for slot in bucket:
+                offset = self._offset(slot)
+                if self._holds(offset, hashed, key_bytes):
+                    self._clear_slot(offset)
+                    return True
+        return False
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock, self._locked(0, 0):
+            for slot in range(self.slots):
+                self._clear_slot(self._offset(slot))
+
+    def __len__(self) -> int:
+        """Return the number of occupied slots, including expired ones."""
+        return sum(self._occupied(self._offset(slot)) for slot in range(self.slots))
+
+    def _occupied(self, offset: int) -> bool:
+        return _SLOT.unpack_from(self._map, offset)[4] != 0
+
+    def _holds(self, offset: int, hashed: int, key_bytes: bytes) -> bool:
+        """Return whether the slot holds the key, only called while the bucket is locked."""
+        _, slot_hash, _, _, key_length, _ = _SLOT.unpack_from(self._map, offset)
+        start = offset + _SLOT.size
+        return slot_hash == hashed and self._map[start : start + key_length] == key_bytes
+
+    def _clear_slot(self, offset: int) -> None:
+        sequence = _SEQUENCE.unpack_from(self._map, offset)[0]
+        _SEQUENCE.pack_into(self._map, offset, sequence + 1)
+        _SLOT.pack_into(self._map, offset, sequence + 2, 0, 0.0, 0.0, 0, 0)
+
+    def _pick_slot(self, bucket: range, hashed: int, key_bytes: bytes, now: float) -> int:
+        """Return the slot to write a key to: its current slot, an empty or expired one, or the oldest one."""
+        oldest, oldest_written = bucket.start, float("inf")
+        for slot in bucket:
+            offset = self._offset(slot)
+            _, _, expires, written, key_length, _ = _SLOT.unpack_from(self._map, offset)
+            if not key_length or self._holds(offset, hashed, key_bytes) or (expires and expires <= now):
+                return slot
+            if written < oldest_written:
+                oldest, oldest_written = slot, written
+        return oldest
@@ -0,0 +1,81 @@
+"""Coalesce concurrent loads of the same key into a single call."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Awaitable, Callable, Hashable
+
+
+class SingleFlight[K: Hashable, V]:
+    """Runs at most one load per key at a time, callers asking for a key that is being loaded wait for that load instead.
+
+    Every waiting caller gets the same result, or the same exception raised again.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without loads in flight."""
+        self._calls: dict[K, Future[V]] = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether the key is being loaded."""
+        return key in self._calls
+
+    def do(self, key: K, load: Callable[[], V]) -> V:
+        """Return the result of `load`, or of the load of `key` already in flight."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if future is None:
+                future = self._calls[key] = Future()
+        if not leader:
+            return future.result()
+        try:
+            result = load()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+
+class AsyncSingleFlight[K: Hashable, V]:
+    """Like `SingleFlight` for coroutines, every caller awaits the one task loading a key.
+
+    The task is shielded, so a caller that gets cancelled doesn't cancel the load for the others.
+    """
+
+    def __init__(self) -> None:
+        """Initialize without loads in flight."""
+        self._calls: dict[K, asyncio.Future[V]] = {}
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether the key is being loaded."""
+        return key in self._calls
+
+    def start(self, key: K, load: Callable[[], Awaitable[V]]) -> asyncio.Future[V]:
+        """Start loading the key unless it is already in flight, returning the task doing so."""
+        if (task := self._calls.get(key)) is not None:
+            return task
+        task = self._calls[key] = asyncio.ensure_future(load())
+
+        def forget(done: asyncio.Future[V]) -> None:
+            del self._calls[key]
+            if not done.cancelled():
+                done.exception()  # Raised to the callers awaiting it, don't warn when nobody does.
+
+        task.add_done_callback(forget)
+        return task
+
+    async def do(self, key: K, load: Callable[[], Awaitable[V]]) -> V:
+        """Return the result of `load`, or of the load of `key` already in flight."""
+        return await asyncio.shield(self.start(key, load))
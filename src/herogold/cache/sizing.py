@@ -0,0 +1,23 @@
+"""Estimates of the memory held by cached values."""
+
+from __future__ import annotations
+
+import sys
+from collections.abc import Collection, Mapping
+
+
+def estimate_size(value: object) -> int:
+    """Estimate the bytes held by `value`: its own size, plus that of its items or attributes one level deep.
+
+    Cheap enough to run on every insert, but shared and deeply nested objects are not accounted for.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, str | bytes | bytearray | memoryview):
+        return size
+    if isinstance(value, Mapping):
+        return size + sum(sys.getsizeof(key) + sys.getsizeof(item) for key, item in value.items())
+    if isinstance(value, Collection):
+        return size + sum(sys.getsizeof(item) for item in value)
+    if attributes := getattr(value, "__dict__", None):
+        return size + sys.getsizeof(attributes) + sum(sys.getsizeof(item) for item in attributes.values())
+    return size
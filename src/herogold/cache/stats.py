@@ -0,0 +1,98 @@
+"""Counters describing how well a cache works."""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Self
+
+from herogold.log import INFO, getLogger
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Mapping
+    from types import TracebackType
+
+_log = getLogger(__name__)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Counters of a single cache, updated as it is used."""
+
+    hits: int = 0
+    misses: int = 0
+    stale_hits: int = 0
+    """Lookups served an expired value while it is being refreshed."""
+    evictions: int = 0
+    """Entries dropped by the eviction policy to stay within `maxsize`."""
+    expirations: int = 0
+    """Entries dropped because their time to live ran out."""
+    collected: int = 0
+    """Entries dropped because their weakly referenced value was garbage collected."""
+
+    @property
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups that were served a value, 0 before the first lookup."""
+        served = self.hits + self.stale_hits
+        lookups = served + self.misses
+        return served / lookups if lookups else 0.0
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the counters and hit rate as a plain dict."""
+        return {**asdict(self), "hit_rate": self.hit_rate}
+
+
+class StatsLogger:
+    """Logs a snapshot of a cache every `interval` seconds from a background thread, until stopped."""
+
+    def __init__(
+        self,
+        snapshot: Callable[[], Mapping[str, float]],
+        interval: float,
+        *,
+        name: str = "cache",
+        level: int = INFO,
+    ) -> None:
+        """Log the result of `snapshot` as one line, prefixed with the `name` of the cache."""
+        self.snapshot = snapshot
+        self.interval = interval
+        self.name = name
+        self.level = level
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"{name}-stats", daemon=True)
+
+    def __enter__(self) -> Self:
+        """Context manager entry — start logging."""
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Context manager exit — stop logging."""
+        self.stop()
+
+    def start(self) -> Self:
+        """Start logging in the background."""
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop logging, waiting for a line that is being written."""
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def log(self) -> None:
+        """Log a snapshot right away."""
+        line = " ".join(f"{key}={value:.4g}" for key, value in self.snapshot().items())
+        _log.log(self.level, "%s: %s", self.name, line)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.log()
+            except Exception:  # noqa: BLE001 # A failing snapshot shouldn't stop later ones.
+                _log.exception("Logging the statistics of %s failed.", self.name)
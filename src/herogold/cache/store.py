@@ -0,0 +1,145 @@
+"""A thread-safe key-value store with an optional size bound and per-entry expiry."""
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from typing import TYPE_CHECKING, cast
+
+from herogold.sentinel import MISSING
+
+from .policies import PolicyName, get_policy
+from .stats import CacheStats
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class Store[K, V]:
+    """Holds values by key, evicting keys picked by a policy once full, and dropping entries once they expire.
+
+    Expired entries are dropped lazily when looked up,
+    and swept all at once by the first access after every `sweep_interval` seconds.
+    With a `stale` grace period, expired entries are kept that much longer for `lookup` to serve while they are refreshed.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        maxsize: int | None = None,
+        *,
+        policy: PolicyName = "lru",
+        ttl: float | None = None,
+        weigher: Callable[[V], int] | None = None,
+        sweep_interval: float | None = None,
+        stale: float = 0.0,
+    ) -> None:
+        """Initialize an empty store.
+
+        Entries live for `ttl` seconds unless given their own when set, or forever without either.
+        `sweep_interval` defaults to the `ttl`.
+        """
+        self.ttl = ttl
+        self.sweep_interval = ttl if sweep_interval is None else sweep_interval
+        self.stale = stale
+        self.stats = CacheStats()
+        self.clock: Callable[[], float] = time.monotonic
+        self._entries: dict[K, tuple[V, float]] = {}
+        """The value and expiry deadline of every key."""
+        self._policy = None if maxsize is None else get_policy(policy, maxsize)
+        self._weigher = weigher
+        self._lock = threading.RLock()
+        self._last_sweep: float | None = None
+
+    def __len__(self) -> int:
+        """Return the number of entries, including expired ones that haven't been swept yet."""
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        """Return whether the key has a value that hasn't expired."""
+        entry = self._entries.get(cast("K", key))
+        return entry is not None and entry[1] > self.clock()
+
+    def get(self, key: K, default: V = MISSING) -> V:
+        """Return the value of the key, or `default` when it is missing or expired."""
+        found = self.lookup(key, stale=False)
+        return default if found is None else found[0]
+
+    def lookup(self, key: K, *, stale: bool = True) -> tuple[V, bool] | None:
+        """Return the value of the key and whether it is fresh, or None when it is missing.
+
+        Expired values still within the store's `stale` grace period are returned as not fresh, unless `stale` is False.
+        """
+        with self._lock:
+            now = self._maybe_sweep()
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] + self.stale <= now:
+                self._remove(key)
+                self.stats.expirations += 1
+                entry = None
+            if entry is None or (not stale and entry[1] <= now):
+                self.stats.misses += 1
+                return None
+            value, expires = entry
+            fresh = expires > now
+            if fresh:
+                self.stats.hits += 1
+            else:
+                self.stats.stale_hits += 1
+            if self._policy is not None:
+                self._policy.access(key)
+            return value, fresh
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store a value, expiring after `ttl` seconds, or the store's own ttl when not given."""
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            now = self._maybe_sweep()
+            self._entries.pop(key, None)  # Keeps the entries in the order they were set.
+            self._entries[key] = (value, math.inf if ttl is None else now + ttl)
+            if self._policy is None:
+                return
+            for evicted in self._policy.add(key, 1 if self._weigher is None else self._weigher(value)):
+                self._entries.pop(evicted, None)
+                self.stats.evictions += 1
+
+    def delete(self, key: K) -> bool:
+        """Remove a key, returning whether it was stored."""
+        with self._lock:
+            return self._remove(key)
+
+    def clear(self) -> None:
+        """Remove every entry, keeping the statistics."""
+        with self._lock:
+            self._entries.clear()
+            if self._policy is not None:
+                self._policy.clear()
+
+    def sweep(self) -> int:
+        """Remove every expired entry, returning how many were removed."""
+        with self._lock:
+            now = self.clock()
+            expired = [key for key, (_, expires) in self._entries.items() if expires + self.stale <= now]
+            for key in expired:
+                self._remove(key)
+            self.stats.expirations += len(expired)
+            return len(expired)
+
+    def _maybe_sweep(self) -> float:
+        """Sweep when the sweep interval has passed, returning the current time."""
+        now = self.clock()
+        if self.sweep_interval is None:
+            return now
+        if self._last_sweep is None:
+            self._last_sweep = now
+        elif now - self._last_sweep >= self.sweep_interval:
+            self.sweep()
+            self._last_sweep = now
+        return now
+
+    def _remove(self, key: K) -> bool:
+        if self._entries.pop(key, MISSING) is MISSING:
+            return False
+        if self._policy is not None:
+            self._policy.remove(key)
+        return True
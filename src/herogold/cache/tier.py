@@ -0,0 +1,25 @@
+"""The interface of the cache tiers consulted when the in-process store misses."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Protocol
+
+from herogold.sentinel import MISSING
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable
+
+
+class Tier(Protocol):
+    """A slower cache behind the in-process store, like one shared with other processes or kept on disk.
+
+    Keys and values are serialized, so they must be builtin types or picklable.
+    """
+
+    def get(self, key: Hashable, default: object = MISSING) -> object:
+        """Return the value of the key, or `default` when it is missing or expired."""
+        ...
+
+    def set(self, key: Hashable, value: object, ttl: float | None = None) -> bool:
+        """Store a value for `ttl` seconds or forever, returning whether it was stored."""
+        ...
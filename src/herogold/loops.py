@@ -2,33 +2,231 @@
 
 from __future__ import annotations
 
+import asyncio
+import atexit
+import itertools
+import math
 import os
+import threading
+import time
+from collections import deque
 from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
 from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
 
 from herogold.asynchronous import get_async_loop
+from herogold.workers.metrics import TaskHook, TaskMetrics, pickled_size
 
 if TYPE_CHECKING:
     from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable, Iterator
 
 cpu_count = os.cpu_count() or 1
 
+target_chunk_seconds = 0.05
+"""How long a single chunk should keep a worker busy, long enough to amortize the IPC round-trip."""
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = threading.Lock()
+_latencies: WeakKeyDictionary[Callable[..., object], float] = WeakKeyDictionary()
+"""Measured seconds per item for each action, smoothed over calls."""
+
 
 def _square(value: int) -> int:
     return value * value
 
-def parallel[T, P](action: Callable[[P], T], data: Iterable[P]) -> Iterator[T]:
-    """Run a function in parallel across multiple CPU cores."""
-    with ProcessPoolExecutor(max_workers=cpu_count) as executor:
-        yield from executor.map(action, data, chunksize=10)
 
-async def a_parallel[T, P](action: Callable[[P], T], data: AsyncIterable[P]) -> AsyncIterator[T]:
-    """Run a function in parallel across multiple CPU cores from async code."""
-    loop = get_async_loop()
+type _Timed[T] = tuple[T, float, float, int | None]
+"""A result, when its action started and finished, and the pickled size of the result when measured."""
+
+
+def _timed[T, P](action: Callable[[P], T], item: P, *, measure: bool = False) -> _Timed[T]:
+    started = time.time()
+    result = action(item)
+    finished = time.time()
+    return result, started, finished, pickled_size(result) if measure else None
+
+
+def get_pool() -> ProcessPoolExecutor:
+    """Return the process pool shared by `parallel` and `a_parallel`, creating it on first use."""
+    global _pool  # noqa: PLW0603
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=cpu_count)
+        return _pool
+
+
+def shutdown(*, wait: bool = True, cancel_futures: bool = False) -> None:
+    """Shut down the shared process pool. The next call to `get_pool` creates a new one."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+
+def _forget_pool() -> None:
+    """Drop the inherited pool in a forked child, its worker processes belong to the parent."""
+    global _pool, _pool_lock  # noqa: PLW0603
+    _pool = None
+    _pool_lock = threading.Lock()
+
+
+atexit.register(shutdown)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_pool)
+
+
+def _record_latency(action: Callable[..., object], seconds_per_item: float) -> None:
+    try:
+        previous = _latencies.get(action)
+        _latencies[action] = seconds_per_item if previous is None else (previous + seconds_per_item) / 2
+    except TypeError:
+        return  # The action can't be weakly referenced, so there is nothing to remember it by.
+
+
+def adaptive_chunksize(action: Callable[..., object], count: int) -> int:
+    """Pick a chunksize for `count` items, based on the measured latency of earlier runs of `action`.
+
+    Chunks are made long enough to keep a worker busy for `target_chunk_seconds`,
+    but never so large that there are fewer than four chunks per worker to balance load with.
+    """
+    balanced = max(1, math.ceil(count / (cpu_count * 4)))
+    try:
+        latency = _latencies.get(action)
+    except TypeError:
+        latency = None
+    if not latency:
+        return balanced
+    return max(1, min(balanced, math.ceil(target_chunk_seconds / latency)))
+
+
+def parallel[T, P](
+    action: Callable[[P], T],
+    data: Iterable[P],
+    *,
+    chunksize: int | None = None,
+    on_task: TaskHook | None = None,
+) -> Iterator[T]:
+    """Run a function in parallel across multiple CPU cores.
+
+    Uses the shared pool from `get_pool`, the chunksize is adapted to the input when not given.
+    An `on_task` hook is called with the `TaskMetrics` of every item as its result is yielded,
+    task ids being the index of the item.
+    """
+    items = list(data)
+    if chunksize is None:
+        chunksize = adaptive_chunksize(action, len(items))
+    measure = on_task is not None
+    payloads = [pickled_size(item) for item in items] if measure else []
+
+    busy = 0.0
+    enqueued = time.time()
+    try:
+        timed = partial(_timed, action, measure=measure)
+        for index, (result, started, finished, result_bytes) in enumerate(get_pool().map(timed, items, chunksize=chunksize)):
+            busy += finished - started
+            if on_task is not None:
+                on_task(TaskMetrics(index, enqueued, started, finished, True, payloads[index], result_bytes))  # noqa: FBT003
+            yield result
+    except BrokenProcessPool:
+        shutdown(wait=False)
+        raise
+    if items:
+        _record_latency(action, busy / len(items))
+
+
+class _Tracker[T, P]:
+    """Submits the items of `a_parallel` to the shared pool, reporting their metrics once they finish."""
+
+    def __init__(self, action: Callable[[P], T], on_task: TaskHook | None) -> None:
+        self.loop = get_async_loop()
+        self.executor = get_pool()
+        self.timed = partial(_timed, action, measure=on_task is not None)
+        self.on_task = on_task
+        self._task_ids = itertools.count()
+        self._submitted: dict[asyncio.Future[_Timed[T]], tuple[int, float, int | None]] = {}
+
+    def submit(self, item: P) -> asyncio.Future[_Timed[T]]:
+        enqueued = time.time()
+        future = self.loop.run_in_executor(self.executor, self.timed, item)
+        if self.on_task is not None:
+            self._submitted[future] = (next(self._task_ids), enqueued, pickled_size(item))
+        return future
+
+    def finish(self, future: asyncio.Future[_Timed[T]]) -> T:
+        result, started, finished, result_bytes = future.result()
+        if self.on_task is not None:
+            task_id, enqueued, payload_bytes = self._submitted.pop(future)
+            self.on_task(TaskMetrics(task_id, enqueued, started, finished, True, payload_bytes, result_bytes))  # noqa: FBT003
+        return result
+
+
+async def _fill_window[T, P](
+    source: AsyncIterator[P],
+    in_flight: deque[asyncio.Future[T]],
+    max_in_flight: int,
+    submit: Callable[[P], asyncio.Future[T]],
+) -> bool:
+    """Submit items from the source until the window is full, returns False once the source is exhausted."""
+    while len(in_flight) < max_in_flight:
+        try:
+            item = await anext(source)
+        except StopAsyncIteration:
+            return False
+        in_flight.append(submit(item))
+    return True
+
+
+async def a_parallel[T, P](
+    action: Callable[[P], T],
+    data: AsyncIterable[P],
+    *,
+    max_in_flight: int | None = None,
+    ordered: bool = True,
+    on_task: TaskHook | None = None,
+) -> AsyncIterator[T]:
+    """Run a function in parallel across multiple CPU cores from async code.
+
+    Keeps up to `max_in_flight` items (twice the cpu count by default) running in the shared pool,
+    and only reads the next item from `data` once a slot frees up.
+    With `ordered=False` results are yielded as soon as they finish, instead of in input order.
+    An `on_task` hook is called with the `TaskMetrics` of every item as its result is yielded,
+    task ids counting the items in the order they were read from `data`.
+    """
+    if max_in_flight is None:
+        max_in_flight = cpu_count * 2
+    if max_in_flight < 1:
+        msg = f"max_in_flight must be at least 1, got {max_in_flight}"
+        raise ValueError(msg)
+
+    tracker = _Tracker(action, on_task)
+    source = aiter(data)
+    in_flight: deque[asyncio.Future[_Timed[T]]] = deque()
+    has_more = True
+    try:
+        while True:
+            if has_more:
+                has_more = await _fill_window(source, in_flight, max_in_flight, tracker.submit)
+            if not in_flight:
+                return
+            if ordered:
+                future = in_flight.popleft()
+                await future
+                yield tracker.finish(future)
+                continue
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                in_flight.remove(future)
+                yield tracker.finish(future)
+    except BrokenProcessPool:
+        shutdown(wait=False)
+        raise
+    finally:
+        for future in in_flight:
+            future.cancel()
 
-    with ProcessPoolExecutor(max_workers=cpu_count) as executor:
-        async for item in data:
-            yield await loop.run_in_executor(executor, action, item)
 
 async def a_range(count: int) -> AsyncIterator[int]:
     """Asynchronous generator that yields values from 0 to count-1."""
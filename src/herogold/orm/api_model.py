@@ -19,12 +19,15 @@ except ImportError as e:
     raise ImportError(msg) from e
 
 
+from herogold.orm.errors import NotFoundError
 from herogold.orm.model import BaseModel, ExtraData
 
 if TYPE_CHECKING:
     from sqlalchemy.sql.elements import ColumnElement
     from sqlmodel.sql._expression_select_cls import SelectOfScalar
 
+    from herogold.orm.async_model import AsyncBaseModel
+
 
 class Operator(StrEnum):
     """Comparison operators supported by the QUERY endpoint (RFC 10008)."""
@@ -189,6 +192,10 @@ class APIModel[T: BaseModel]:
 
     def query(self, request: QueryRequest) -> Sequence[T]:
         """Run a safe, idempotent query per RFC 10008 (HTTP QUERY)."""
+        return self.model.session.exec(self._build_request_query(request)).all()
+
+    def _build_request_query(self, request: QueryRequest) -> SelectOfScalar[T]:
+        """Build the query selecting the records of a QUERY request."""
         self.model.logger.debug("QUERY %s: %s", self.model.__name__, request, extra={"request": request})
         q = select(self.model).where(self.model.deleted_at == None)  # noqa: E711
         for f in request.filters:
@@ -199,7 +206,7 @@ class APIModel[T: BaseModel]:
             sort_col = col(getattr(self.model, request.sort))
             q = q.order_by(sort_col.desc() if request.order.lower() == "desc" else sort_col.asc())
         offset = (request.page - 1) * request.limit
-        return self.model.session.exec(q.offset(offset).limit(request.limit)).all()
+        return q.offset(offset).limit(request.limit)
 
     def get_all(
         self,
@@ -249,3 +256,60 @@ class APIModel[T: BaseModel]:
         inst = self.model.get(_id)
         self.model.delete(inst)
         return None
+
+
+class AsyncAPIModel[T: AsyncBaseModel](APIModel[T]):  # pyright: ignore[reportInvalidTypeArguments]
+    """APIModel registering async handlers, which await an `AsyncBaseModel` instead of blocking the threadpool."""
+
+    async def query(self, request: QueryRequest) -> Sequence[T]:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Run a safe, idempotent query per RFC 10008 (HTTP QUERY)."""
+        return await self.model.fetch(self._build_request_query(request))
+
+    async def get_all(  # pyright: ignore[reportIncompatibleMethodOverride]
+        self,
+        sort: str | None = None,
+        order: Literal["asc", "desc"] = "asc",
+        page: int = 1,
+        limit: int = 100,
+        **kwargs: str,  # Allows for dynamic fieldname filtering based on query parameters
+    ) -> Sequence[T]:
+        """Get a page of records with optional sorting and filtering."""
+        q = self._build_filtered_query(kwargs)
+        if sort and hasattr(self.model, sort):
+            sort_col = col(getattr(self.model, sort))
+            q = q.order_by(sort_col.desc() if order.lower() == "desc" else sort_col.asc())
+        return await self.model.fetch(q.offset((page - 1) * limit).limit(limit))
+
+    async def get(self, _id: int) -> T | int:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Get a record by ID."""
+        try:
+            return await self.model.get(_id)
+        except NotFoundError:
+            return status.HTTP_404_NOT_FOUND
+
+    async def create(self, item: T) -> T:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Create a new record."""
+        if extras := getattr(item, "extra", None):
+            item.extra = ExtraData(data=extras)
+        await item.add()
+        return item
+
+    async def update(self, item: T) -> int | None:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Update an existing record.
+
+        Item can be a full model instance or a partial update with only the fields to be updated.
+        """
+        if not item.id or not await self.model.fetch(select(self.model).where(self.model.id == item.id)):
+            return status.HTTP_404_NOT_FOUND
+        if extras := getattr(item, "extra", None):
+            item.extra = ExtraData(data=extras)
+        await item.update()
+        return None
+
+    async def delete(self, _id: int) -> int | None:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Delete a record by ID."""
+        try:
+            await (await self.model.get(_id)).delete()
+        except NotFoundError:
+            return status.HTTP_404_NOT_FOUND
+        return None
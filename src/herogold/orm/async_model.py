@@ -0,0 +1,176 @@
+"""Models reading and writing through SQLAlchemy's asyncio engine, without blocking the event loop."""
+
+from __future__ import annotations
+
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime
+from functools import partial
+from typing import TYPE_CHECKING, ClassVar
+
+from sqlmodel import select
+
+from .constants import async_session
+from .errors import AlreadyExistsError, NotFoundError
+from .model import BaseModel
+from .transaction import AsyncTransaction, current_async_transaction, current_transaction
+
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator, Callable, Sequence
+
+    from sqlalchemy.orm import Mapped
+    from sqlmodel.ext.asyncio.session import AsyncSession
+    from sqlmodel.sql._expression_select_cls import SelectOfScalar
+
+    from herogold.orm.utils import SELF
+
+
+class AsyncBaseModel(BaseModel):
+    """Base model class whose `add`, `update`, `get`, `get_all`, `delete` and `from_` are awaited.
+
+    Every call uses a new session unless one is given or the call is made inside `transaction`,
+    so records are returned loaded, as they can't lazy load attributes once their session is closed.
+    """
+
+    identity_map_size: ClassVar[int] = 0
+    """Disabled, records are only served from the identity map within the session that loaded them."""
+    async_session: ClassVar[Callable[[], AsyncSession]] = async_session
+    """Creates the sessions used when none is given."""
+
+    @classmethod
+    @asynccontextmanager
+    async def _async_session(cls, session: AsyncSession | None = None) -> AsyncGenerator[AsyncSession]:
+        """Yield the given session, the one of the current transaction, or a new one that is closed afterwards."""
+        if session is None and (transaction := current_async_transaction()) is not None:
+            session = transaction.session
+        if session is not None:
+            yield session
+            return
+        async with cls.async_session() as new:
+            yield new
+
+    @classmethod
+    def transaction(cls, session: AsyncSession | None = None) -> AsyncTransaction:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Group writes into one commit with `async with Model.transaction():`, on a new session unless one is given.
+
+        Inside the block writes only flush, the block commits once it exits and rolls back when it raises.
+        """
+        if session is None:
+            return AsyncTransaction(cls.async_session(), close=True)
+        return AsyncTransaction(session)
+
+    @classmethod
+    async def _commit_async(cls, session: AsyncSession, after: Callable[[], object] | None = None) -> None:
+        """Commit the session, or only flush it inside a transaction, calling `after` once committed."""
+        if (transaction := current_transaction(session)) is not None:
+            await session.flush()
+            if after is not None:
+                transaction.after_commit(after)
+            return
+        await session.commit()
+        if after is not None:
+            after()
+
+    @classmethod
+    async def _rollback_async(cls, session: AsyncSession) -> None:
+        """Roll back the session, unless a transaction on it rolls back once its block exits."""
+        if current_transaction(session) is None:
+            await session.rollback()
+
+    async def add(self, session: AsyncSession | None = None) -> None:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Add a record to Database."""
+        self.logger.debug("Adding record: %s", self, extra={"record": self})
+        if self.id is not None:
+            msg = f"Record with {self.__class__.__name__}.id={self.id} already exists."
+            raise AlreadyExistsError(msg)
+        async with self._async_session(session) as active:
+            await self._create_record_async(active)
+
+    async def update(self, session: AsyncSession | None = None) -> None:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Create or update a record in Database.
+
+        If the record already exists (has an id), it will be updated.
+        If the record does not exist (no id), it will be created.
+        """
+        self.logger.debug("Record update requested: %s", self, extra={"record": self})
+        async with self._async_session(session) as active:
+            result = await active.exec(select(self.__class__).where(self.__class__.id == self.id).with_for_update())
+            if known := result.first():
+                self.logger.debug("Updating record: %s", self, extra={"record": self})
+                self._apply_to(known)
+                active.add(known)
+                await self._commit_async(active)
+                known._forget()  # noqa: SLF001
+                return
+            await self._create_record_async(active)
+
+    async def _create_record_async(self, session: AsyncSession) -> None:
+        self.logger.debug("Creating record: %s", self, extra={"record": self})
+        session.add(self)
+        try:
+            await self._commit_async(session, partial(self._adjust_count, 1))
+        except BaseException:
+            await self._rollback_async(session)
+            raise
+        self._forget()
+
+    @classmethod
+    async def get(  # pyright: ignore[reportIncompatibleMethodOverride]
+        cls: type[SELF],
+        id_: int,
+        session: AsyncSession | None = None,
+        *,
+        with_for_update: bool = False,
+    ) -> SELF:
+        """Get a record from Database."""
+        cls.logger.debug("Getting record: %s", id_, extra={"id": id_})
+        query = select(cls).where(cls.id == id_)
+        if with_for_update:
+            query = query.with_for_update()
+        if known := (await cls.fetch(query, session))[:1]:
+            return known[0]
+        msg = f"Record with {cls.__name__}.id={id_} not found."
+        raise NotFoundError(msg)
+
+    @classmethod
+    async def get_all(cls: type[SELF], session: AsyncSession | None = None) -> Sequence[SELF]:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Get all records from Database."""
+        cls.logger.debug("Getting all records: %s", cls.__name__, extra={"class": cls.__name__})
+        return await cls.fetch(select(cls), session)
+
+    @classmethod
+    async def from_[T](cls: type[SELF], column: Mapped[T], value: T, session: AsyncSession | None = None) -> Sequence[SELF]:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Get the records from Database by field and value."""
+        cls.logger.debug(
+            "Getting record from field: %s, %s == %s",
+            cls,
+            column,
+            value,
+            extra={"class": cls.__name__, "column": column, "value": value},
+        )
+        return await cls.fetch(select(cls).where(column == value), session)
+
+    @classmethod
+    async def fetch(cls: type[SELF], query: SelectOfScalar[SELF], session: AsyncSession | None = None) -> Sequence[SELF]:
+        """Return all records selected by the query."""
+        async with cls._async_session(session) as active:
+            return (await active.exec(query)).all()
+
+    async def delete(self, session: AsyncSession | None = None) -> None:  # pyright: ignore[reportIncompatibleMethodOverride]
+        """Delete a record from Database."""
+        self.logger.debug("Deleting record: %s", self, extra={"record": self})
+        async with self._async_session(session) as active:
+            result = await active.exec(
+                select(self.__class__)
+                .where(
+                    self.__class__.id == self.id,
+                    self.__class__.deleted_at == None,  # noqa: E711
+                )
+                .with_for_update(),
+            )
+            if known := result.first():
+                known.deleted_at = datetime.now(UTC)
+                await self._commit_async(active, partial(self._adjust_count, -1))
+                known._forget()  # noqa: SLF001
+                return
+        msg = f"Record with {self.__class__.__name__}.id={self.id} not found for deletion."
+        raise NotFoundError(msg)
@@ -2,16 +2,29 @@
 
 from __future__ import annotations
 
+from functools import cache
+from typing import TYPE_CHECKING
+
 from sqlalchemy import URL
 from sqlmodel import Session, create_engine
 
 from .config import DbConfig
+from .session import SessionRegistry
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sqlalchemy import Engine
+    from sqlalchemy.ext.asyncio import AsyncEngine
+    from sqlmodel.ext.asyncio.session import AsyncSession
 
 
 class DbUrl:
     """Class containing database URL components."""
 
     driver = DbConfig("postgresql")
+    async_driver = DbConfig("postgresql+psycopg")
+    """Driver of the engine used by `AsyncBaseModel`, which has to support asyncio."""
     username = DbConfig("postgres")
     password = DbConfig("SECURE_PASSWORD")
     host = DbConfig("postgres")
@@ -19,20 +32,96 @@ class DbUrl:
     database = DbConfig("postgres_db")
 
 
+class DbPool:
+    """Class containing connection pool settings."""
+
+    size = DbConfig(5)
+    max_overflow = DbConfig(10)
+    pre_ping = DbConfig(True)  # noqa: FBT003
+    recycle = DbConfig(1800)
+    """Seconds after which connections are replaced, -1 keeps them forever."""
+    timeout = DbConfig(30)
+    """Seconds to wait for a connection once the pool and its overflow are in use."""
+
+
 CASCADE = "CASCADE"
-DATABASE_URL = URL.create(
-    DbUrl.driver,
-    username=DbUrl.username,
-    password=DbUrl.password,
-    host=DbUrl.host,
-    port=DbUrl.port,
-    database=DbUrl.database,
-)
-engine = create_engine(DATABASE_URL, echo=False)
-session = Session(engine)
+
+
+@cache
+def get_database_url() -> URL:
+    """Return the URL of the database, built from `DbUrl` on first use."""
+    return URL.create(
+        DbUrl.driver,
+        username=DbUrl.username,
+        password=DbUrl.password,
+        host=DbUrl.host,
+        port=DbUrl.port,
+        database=DbUrl.database,
+    )
+
+
+@cache
+def get_async_database_url() -> URL:
+    """Return the URL of the database for the async engine, using `DbUrl.async_driver`."""
+    return get_database_url().set(drivername=DbUrl.async_driver)
+
+
+def _pool_options() -> dict[str, object]:
+    return {
+        "echo": False,
+        "pool_size": DbPool.size,
+        "max_overflow": DbPool.max_overflow,
+        "pool_pre_ping": DbPool.pre_ping,
+        "pool_recycle": DbPool.recycle,
+        "pool_timeout": DbPool.timeout,
+    }
+
+
+@cache
+def get_engine() -> Engine:
+    """Return the engine, created on first use so importing models doesn't load the database driver."""
+    return create_engine(get_database_url(), **_pool_options())
+
+
+@cache
+def get_async_engine() -> AsyncEngine:
+    """Return the engine used by `AsyncBaseModel`, created on first use as it needs the asyncio extra of SQLAlchemy."""
+    from sqlalchemy.ext.asyncio import create_async_engine  # noqa: PLC0415
+
+    return create_async_engine(get_async_database_url(), **_pool_options())
+
+
+def new_session() -> Session:
+    """Return a new session on the engine."""
+    return Session(get_engine())
+
+
+def async_session() -> AsyncSession:
+    """Return a new session on the async engine, keeping records loaded after commits as they can't lazy load."""
+    from sqlmodel.ext.asyncio.session import AsyncSession  # noqa: PLC0415
+
+    return AsyncSession(get_async_engine(), expire_on_commit=False)
+
+
+session = SessionRegistry(new_session)
+"""Sessions on the engine, one per thread or asyncio task, the engine is created by the first one."""
+
+_lazy: dict[str, Callable[[], object]] = {
+    "ASYNC_DATABASE_URL": get_async_database_url,
+    "DATABASE_URL": get_database_url,
+    "engine": get_engine,
+}
+
+
+def __getattr__(name: str) -> object:
+    """Create the URLs and engine when first looked up, instead of when importing the module."""
+    if (factory := _lazy.get(name)) is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    return factory()
 
 
 class SessionMixin:
     """Mixin class to provide a session for database operations."""
 
-    session: Session = session
+    session: Session | SessionRegistry = session
@@ -0,0 +1,52 @@
+"""Record counts that are kept up to date by writes instead of counting rows on every call."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+
+class RecordCount:
+    """A count of the records of one model, adjusted by its writes and counted again once older than `ttl` seconds.
+
+    Writes made through other sessions or processes are only picked up once the count is counted again,
+    a `ttl` of None never counts again unless invalidated.
+    """
+
+    def __init__(self, ttl: float | None = None) -> None:
+        """Initialize a count that isn't known yet."""
+        self.ttl = ttl
+        self.clock: Callable[[], float] = time.monotonic
+        self._value: int | None = None
+        self._counted_at = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def value(self) -> int | None:
+        """Return the current count, or None when it isn't known or too old."""
+        if self._value is None or (self.ttl is not None and self.clock() - self._counted_at >= self.ttl):
+            return None
+        return self._value
+
+    def get(self, count: Callable[[], int]) -> int:
+        """Return the count, calling `count` when it isn't known or too old, once for concurrent callers."""
+        with self._lock:
+            if (value := self.value) is None:
+                value = self._value = count()
+                self._counted_at = self.clock()
+            return value
+
+    def adjust(self, delta: int) -> None:
+        """Add records that were created, or remove deleted ones with a negative delta, when the count is known."""
+        with self._lock:
+            if self._value is not None:
+                self._value = max(0, self._value + delta)
+
+    def invalidate(self) -> None:
+        """Forget the count, the next `get` counts again."""
+        with self._lock:
+            self._value = None
@@ -7,25 +7,33 @@ from __future__ import annotations
 
 from datetime import UTC, datetime
 from functools import partial
+from itertools import batched
 from types import NoneType
 from typing import TYPE_CHECKING, Any, ClassVar, Unpack
 
-from sqlalchemy import BigInteger, ScalarResult, func
+from sqlalchemy import BigInteger, ScalarResult, func, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import object_session
 from sqlmodel import Field, Session, col, select
 from sqlmodel import SQLModel as BaseSQLModel
 
+from herogold.cache import Store
 from herogold.log import LoggerMixin
 from herogold.orm.utils import SELF, Relationship
 from herogold.typing.check import contains_sub_type
 
 from .constants import session as db_session
+from .counts import RecordCount
 from .errors import AlreadyExistsError, NotFoundError
+from .session import SessionRegistry, current_session
+from .transaction import Transaction, current_transaction
 
 if TYPE_CHECKING:
     import logging
-    from collections.abc import Sequence
+    from collections.abc import Callable, Iterable, Mapping, Sequence
 
     from pydantic import ConfigDict
+    from sqlalchemy import Table
     from sqlalchemy.orm import Mapped
 
 models: set[type[BaseModel]] = set()
@@ -61,10 +69,25 @@ class BaseModel(BaseSQLModel):
     deleted_at: datetime | None = Field(default=None)
     extra = Relationship["ExtraData"](optional=True)
 
-    session: ClassVar[Session] = db_session
+    session: ClassVar[Session | SessionRegistry] = db_session
+    """Session used when none is given, a registry gives every thread or asyncio task its own."""
     logger: ClassVar[logging.Logger] = ModelLogger().logger
-    __count: ClassVar[int | None] = None
-    """Cached count of records. avoiding excessive queries."""
+    count_ttl: ClassVar[float | None] = 60.0
+    """Seconds `count` is served from its running total, picking up writes of other sessions afterwards."""
+    count_estimated: ClassVar[bool] = False
+    """Count using the table statistics of Postgres, cheap on huge tables but approximate and including deleted records."""
+    record_count: ClassVar[RecordCount | None] = None
+    """Running total of records served by `count`, created per model from its ttl."""
+    get_many_chunk_size: ClassVar[int] = 500
+    """Ids selected per query by `get_many`, staying below the bound parameter limits of databases."""
+    batch_size: ClassVar[int] = 1000
+    """Records written per statement by `add_all` and `upsert_all`."""
+    identity_map_size: ClassVar[int] = 1024
+    """Records per model kept by `get`, 0 always queries the database."""
+    identity_map_ttl: ClassVar[float | None] = 60.0
+    """Seconds a record is served by `get` without querying, picking up changes made by other sessions afterwards."""
+    identity_map: ClassVar[Store[int, BaseModel] | None] = None
+    """Records recently fetched by `get`, by id, created per model from its size and ttl."""
 
     @property
     def relations(self) -> dict[str, type[BaseModel]]:
@@ -76,18 +99,35 @@ class BaseModel(BaseSQLModel):
         }
 
     @classmethod
-    def count(cls) -> int:
-        """Return the total count of records in the model."""
-        if not cls.__count or cls.session.identity_map.check_modified():
-            cls.__count = cls.session.exec(
-                select(func.count(col(cls.id))).where(cls.deleted_at == None),  # noqa: E711
-            ).one()
-        return cls.__count
+    def count(cls, session: Session | None = None) -> int:
+        """Return the total count of records in the model.
+
+        Records are counted once per `count_ttl`, records added and deleted in between are added to or removed from that.
+        """
+        session = cls._get_session(session)
+        if cls.record_count is None:
+            return cls._count_records(session)
+        return cls.record_count.get(partial(cls._count_records, session))
+
+    @classmethod
+    def _count_records(cls, session: Session) -> int:
+        if cls.count_estimated and session.get_bind().dialect.name == "postgresql":
+            estimate = session.connection().execute(
+                text("SELECT reltuples FROM pg_class WHERE oid = CAST(:table AS regclass)"),
+                {"table": cls.__tablename__},
+            ).scalar_one_or_none()
+            if estimate is not None and estimate >= 0:  # Tables that were never analyzed estimate -1.
+                return int(estimate)
+        return session.exec(
+            select(func.count(col(cls.id))).where(cls.deleted_at == None),  # noqa: E711
+        ).one()
 
     def __init_subclass__(cls, **kwargs: Unpack[ConfigDict]) -> None:
         """Register subclass in models set."""
         super().__init_subclass__(**kwargs)
         models.add(cls)
+        cls.identity_map = Store(cls.identity_map_size, ttl=cls.identity_map_ttl) if cls.identity_map_size > 0 else None
+        cls.record_count = RecordCount(cls.count_ttl)
 
     def add(self: SELF, session: Session | None = None) -> None:
         """Add a record to Database."""
@@ -97,6 +137,145 @@ class BaseModel(BaseSQLModel):
             raise AlreadyExistsError(msg)
         self._create_record(session)
 
+    @classmethod
+    def add_all(
+        cls: type[SELF],
+        records: Iterable[SELF],
+        session: Session | None = None,
+        *,
+        batch_size: int | None = None,
+        copy: bool = False,
+    ) -> int:
+        """Add many records to Database in a single transaction, returning how many were added.
+
+        Records are inserted `batch_size` at a time, getting their ids like `add`.
+        With `copy` they are streamed with COPY on Postgres with psycopg 3, which is much faster but leaves their ids unset.
+        """
+        cls.logger.debug("Adding records: %s", cls.__name__, extra={"class": cls.__name__})
+        session = cls._get_session(session)
+        added = 0
+        try:
+            if copy and cls._can_copy(session):
+                added = cls._copy_records(records, session)
+            else:
+                for batch in batched(records, batch_size or cls.batch_size):
+                    cls._check_new(batch)
+                    session.add_all(batch)
+                    session.flush()
+                    added += len(batch)
+            cls._commit(session, partial(cls._adjust_count, added))
+        except BaseException:
+            cls._rollback(session)
+            raise
+        return added
+
+    @classmethod
+    def upsert_all(
+        cls: type[SELF],
+        records: Iterable[SELF],
+        session: Session | None = None,
+        *,
+        conflict: Sequence[str] = ("id",),
+        ignore: bool = False,
+        batch_size: int | None = None,
+    ) -> None:
+        """Insert many records in a single transaction, updating the rows they conflict with on the `conflict` columns.
+
+        With `ignore` conflicting rows are kept as they are. Records are written as rows, without adding them to the session.
+        Supported on Postgres and SQLite.
+        """
+        cls.logger.debug("Upserting records: %s", cls.__name__, extra={"class": cls.__name__})
+        session = cls._get_session(session)
+        connection = session.connection()
+        insert = cls._dialect_insert(connection.dialect.name)
+        try:
+            for batch in batched(records, batch_size or cls.batch_size):
+                rows = [record._row() for record in batch]  # noqa: SLF001
+                # Rows without an id leave it to the database, and an executemany needs the same columns for every row.
+                for group in ([row for row in rows if "id" in row], [row for row in rows if "id" not in row]):
+                    if group:
+                        connection.execute(cls._upsert_statement(insert, group[0], conflict, ignore=ignore), group)
+            cls._commit(session)
+        except BaseException:
+            cls._rollback(session)
+            raise
+        if cls.identity_map is not None:
+            cls.identity_map.clear()
+        if cls.record_count is not None:
+            cls.record_count.invalidate()
+
+    @classmethod
+    def _dialect_insert(cls, dialect: str) -> Callable[[Table], postgresql.Insert | sqlite.Insert]:
+        match dialect:
+            case "postgresql":
+                return postgresql.insert
+            case "sqlite":
+                return sqlite.insert
+            case _:
+                msg = f"Upserting {cls.__name__} records is not supported on {dialect}."
+                raise NotImplementedError(msg)
+
+    @classmethod
+    def _upsert_statement(
+        cls,
+        insert: Callable[[Table], postgresql.Insert | sqlite.Insert],
+        row: Mapping[str, object],
+        conflict: Sequence[str],
+        *,
+        ignore: bool,
+    ) -> postgresql.Insert | sqlite.Insert:
+        statement = insert(cls.__table__)
+        updated = [name for name in row if name not in {*conflict, "id", "created_at"}]
+        if ignore or not updated:
+            return statement.on_conflict_do_nothing(index_elements=conflict)
+        return statement.on_conflict_do_update(
+            index_elements=conflict,
+            set_={**{name: statement.excluded[name] for name in updated}, "updated_at": cls.__cur_utc()},
+        )
+
+    def _row(self) -> dict[str, object]:
+        """Return the column values of the record, leaving out an unset id."""
+        return {
+            column.name: getattr(self, column.name)
+            for column in self.__table__.columns
+            if column.name != "id" or self.id is not None
+        }
+
+    @classmethod
+    def _check_new(cls, records: Iterable[BaseModel]) -> None:
+        for record in records:
+            if record.id is not None:
+                msg = f"Record with {cls.__name__}.id={record.id} already exists."
+                raise AlreadyExistsError(msg)
+
+    @classmethod
+    def _can_copy(cls, session: Session) -> bool:
+        dialect = session.get_bind().dialect
+        return dialect.name == "postgresql" and dialect.driver == "psycopg"
+
+    @classmethod
+    def _copy_records(cls, records: Iterable[SELF], session: Session) -> int:
+        """Stream records into the table with COPY, returning how many were copied."""
+        connection = session.connection()
+        dialect = connection.dialect
+        columns = [column for column in cls.__table__.columns if column.name != "id"]
+        processors = [column.type.bind_processor(dialect) for column in columns]
+        preparer = dialect.identifier_preparer
+        names = ", ".join(preparer.quote(column.name) for column in columns)
+        sql = f"COPY {preparer.format_table(cls.__table__)} ({names}) FROM STDIN"  # Identifiers quoted by the dialect.
+        copied = 0
+        with connection.connection.dbapi_connection.cursor() as cursor, cursor.copy(sql) as copy:
+            for batch in batched(records, cls.batch_size):
+                cls._check_new(batch)
+                for record in batch:
+                    values = [getattr(record, column.name) for column in columns]
+                    copy.write_row([
+                        value if process is None or value is None else process(value)
+                        for value, process in zip(values, processors, strict=True)
+                    ])
+                copied += len(batch)
+        return copied
+
     def update(self: SELF, session: Session | None = None) -> None:
         """Create or update a record in Database.
 
@@ -113,19 +292,63 @@ class BaseModel(BaseSQLModel):
 
     @classmethod
     def get(cls, id_: int, session: Session | None = None, *, with_for_update: bool = False) -> SELF:
-        """Get a record from Database."""
+        """Get a record from Database.
+
+        Records are served from the model's `identity_map` while they belong to the same session,
+        locking a record with `with_for_update` always queries.
+        """
         cls.logger.debug("Getting record: %s", id_, extra={"id": id_})
         session = cls._get_session(session)
+        if not with_for_update and (cached := cls._cached(id_, session)) is not None:
+            return cached
 
         query = select(cls).where(cls.id == id_)
         if with_for_update:
             query = query.with_for_update()
 
         if known := session.exec(query).first():
+            if cls.identity_map is not None:
+                cls.identity_map.set(id_, known)
             return known
         msg = f"Record with {cls.__name__}.id={id_} not found."
         raise NotFoundError(msg)
 
+    @classmethod
+    def get_many(
+        cls: type[SELF],
+        ids: Iterable[int],
+        session: Session | None = None,
+        *,
+        chunk_size: int | None = None,
+    ) -> dict[int, SELF]:
+        """Get the records with the given ids from Database by id, leaving out ids that don't exist.
+
+        Records in the identity map are served from it, the others are selected `chunk_size` ids per query.
+        """
+        ids = list(dict.fromkeys(ids))
+        cls.logger.debug("Getting records: %s", ids, extra={"ids": ids})
+        session = cls._get_session(session)
+        found: dict[int, SELF] = {}
+        missing: list[int] = []
+        for id_ in ids:
+            if (cached := cls._cached(id_, session)) is not None:
+                found[id_] = cached
+            else:
+                missing.append(id_)
+        for chunk in batched(missing, chunk_size or cls.get_many_chunk_size):
+            for record in session.exec(select(cls).where(col(cls.id).in_(chunk))):
+                found[record.id] = record
+                if cls.identity_map is not None:
+                    cls.identity_map.set(record.id, record)
+        return found
+
+    @classmethod
+    def _cached(cls: type[SELF], id_: int, session: Session) -> SELF | None:
+        """Return the record from the identity map, when it was loaded by the same session."""
+        if cls.identity_map is None or (cached := cls.identity_map.get(id_, None)) is None:
+            return None
+        return cached if object_session(cached) is session else None
+
     @classmethod
     def get_all(cls: type[SELF], session: Session | None = None) -> Sequence[SELF]:
         """Get all records from Database."""
@@ -135,9 +358,40 @@ class BaseModel(BaseSQLModel):
 
     @classmethod
     def _get_session(cls, session: Session | None = None) -> Session:
-        """Get the usable session, either the provided one or the default."""
+        """Get the usable session, either the provided one, the one set by `use_session`, or the default."""
         cls.logger.debug("Getting session: %s", session, extra={"session": session})
-        return session or cls.session
+        return session or current_session(cls.session)
+
+    @classmethod
+    def transaction(cls, session: Session | None = None) -> Transaction:
+        """Group writes on the session into one commit, with `with Model.transaction():` or `async with`.
+
+        Inside the block writes only flush, the block commits once it exits and rolls back when it raises.
+        """
+        return Transaction(cls._get_session(session))
+
+    @classmethod
+    def _commit(cls, session: Session, after: Callable[[], object] | None = None) -> None:
+        """Commit the session, or only flush it inside a transaction, calling `after` once committed."""
+        if (transaction := current_transaction(session)) is not None:
+            session.flush()
+            if after is not None:
+                transaction.after_commit(after)
+            return
+        session.commit()
+        if after is not None:
+            after()
+
+    @classmethod
+    def _rollback(cls, session: Session) -> None:
+        """Roll back the session, unless a transaction on it rolls back once its block exits."""
+        if current_transaction(session) is None:
+            session.rollback()
+
+    @classmethod
+    def _adjust_count(cls, delta: int) -> None:
+        if cls.record_count is not None:
+            cls.record_count.adjust(delta)
 
     def delete(self, session: Session | None = None) -> None:
         """Delete a record from Database."""
@@ -152,7 +406,8 @@ class BaseModel(BaseSQLModel):
             .with_for_update(),
         ).first():
             known.deleted_at = self.__cur_utc()
-            session.commit()
+            self._commit(session, partial(self._adjust_count, -1))
+            known._forget()  # noqa: SLF001
             return
         msg = f"Record with {self.__class__.__name__}.id={self.id} not found for deletion."
         raise NotFoundError(msg)
@@ -161,12 +416,20 @@ class BaseModel(BaseSQLModel):
         self.logger.debug("Creating record: %s", self, extra={"record": self})
         session = self._get_session(session)
         session.add(self)
-        session.commit()
+        self._commit(session, partial(self._adjust_count, 1))
+        self._forget()
 
     def _update_record(self, known: SELF, session: Session | None = None) -> None:
         """Update known, with the values from self."""
         self.logger.debug("Updating record: %s", self, extra={"record": self})
         session = self._get_session(session)
+        self._apply_to(known)
+        session.add(known)
+        self._commit(session)
+        known._forget()  # noqa: SLF001
+
+    def _apply_to(self, known: SELF) -> None:
+        """Copy the values of self onto known, marking it updated."""
         for name, info in self.__class__.model_fields.items():
             if name == "id":
                 continue
@@ -188,8 +451,11 @@ class BaseModel(BaseSQLModel):
                 # Set the actual value from the instance, not from field info
                 setattr(known, name, value)
         known.updated_at = self.__cur_utc()
-        session.add(known)
-        session.commit()
+
+    def _forget(self) -> None:
+        """Drop the record from the identity map after it was written."""
+        if self.identity_map is not None and self.id is not None:
+            self.identity_map.delete(self.id)
 
     @classmethod
     def from_[T](cls, column: Mapped[T], value: T, session: Session | None = None) -> ScalarResult[SELF]:
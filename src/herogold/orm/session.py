@@ -0,0 +1,87 @@
+"""Sessions scoped to the thread or asyncio task using them."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING
+from weakref import WeakKeyDictionary
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Generator
+
+    from sqlmodel import Session
+
+_override: ContextVar[Session | None] = ContextVar("session_override", default=None)
+"""Session set by `use_session` for the current thread or asyncio task."""
+
+
+def _current_task() -> asyncio.Task[object] | None:
+    try:
+        return asyncio.current_task()
+    except RuntimeError:  # No event loop running in this thread.
+        return None
+
+
+class SessionRegistry:
+    """Hands out one session per thread, or per asyncio task when used from one, as sessions aren't thread-safe.
+
+    Attributes of the registry are looked up on the current session, so it can stand in for a session.
+    Sessions of tasks are closed once their task is done, those of threads by `remove`.
+    """
+
+    def __init__(self, factory: Callable[[], Session]) -> None:
+        """Initialize the registry, creating sessions with `factory` on first use in a thread or task."""
+        self.factory = factory
+        self._threads = threading.local()
+        self._tasks: WeakKeyDictionary[asyncio.Task[object], Session] = WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def __call__(self) -> Session:
+        """Return the session set by `use_session`, or the session of the current thread or task."""
+        if (session := _override.get()) is not None:
+            return session
+        if (task := _current_task()) is None:
+            if (session := getattr(self._threads, "session", None)) is None:
+                session = self._threads.session = self.factory()
+            return session
+        with self._lock:  # Tasks of several event loops in different threads share the registry.
+            if (session := self._tasks.get(task)) is None:
+                session = self._tasks[task] = self.factory()
+                task.add_done_callback(lambda _: session.close())
+        return session
+
+    def __getattr__(self, name: str) -> object:
+        """Look up attributes on the current session."""
+        if name.startswith("_"):  # Keeps lookups made before __init__, like those of copy and pickle, from recursing.
+            raise AttributeError(name)
+        return getattr(self(), name)
+
+    def remove(self) -> None:
+        """Close the session of the current thread or task, the next use creates a new one."""
+        if (task := _current_task()) is None:
+            session = self._threads.__dict__.pop("session", None)
+        else:
+            with self._lock:
+                session = self._tasks.pop(task, None)
+        if session is not None:
+            session.close()
+
+
+def current_session(default: Session | SessionRegistry) -> Session:
+    """Return the session set by `use_session`, or `default`, taking the current session of a registry."""
+    if (session := _override.get()) is not None:
+        return session
+    return default() if isinstance(default, SessionRegistry) else default
+
+
+@contextmanager
+def use_session(session: Session) -> Generator[Session]:
+    """Make models use `session` by default in the current thread or asyncio task, while in the block."""
+    token = _override.set(session)
+    try:
+        yield session
+    finally:
+        _override.reset(token)
@@ -0,0 +1,161 @@
+"""Transactions grouping the writes of models into a single commit."""
+
+from __future__ import annotations
+
+import asyncio
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from contextvars import Token
+    from types import TracebackType
+
+    from sqlmodel import Session
+    from sqlmodel.ext.asyncio.session import AsyncSession
+
+_transactions: ContextVar[tuple[Transaction, ...]] = ContextVar("transactions", default=())
+"""Transactions entered by the current thread or asyncio task, innermost last."""
+
+
+def current_transaction(session: Session | AsyncSession) -> Transaction | None:
+    """Return the outermost transaction entered on the session by the current thread or task, if any."""
+    return next((transaction for transaction in _transactions.get() if transaction.session is session), None)
+
+
+def current_async_transaction() -> AsyncTransaction | None:
+    """Return the innermost transaction on an `AsyncSession` entered by the current task, if any."""
+    return next(
+        (transaction for transaction in reversed(_transactions.get()) if isinstance(transaction, AsyncTransaction)),
+        None,
+    )
+
+
+class Transaction:
+    """Makes the writes of models on a session only flush, committing them once when the block exits.
+
+    The block rolls back when it raises. Blocks nested on the same session join the outer one,
+    which commits or rolls back everything. Usable with both `with` and `async with`,
+    the latter commits in a worker thread to keep the event loop running.
+    """
+
+    def __init__(self, session: Session) -> None:
+        """Initialize a transaction on the session, starting once entered."""
+        self.session = session
+        self._callbacks: list[Callable[[], object]] = []
+        self._token: Token[tuple[Transaction, ...]] | None = None
+        self._joined = False
+
+    def __enter__(self) -> Self:
+        """Start the transaction, or join the one already entered on the session."""
+        return self._enter()
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Commit the transaction, or roll it back when the block raised."""
+        if not self._leave():
+            return
+        if exc_type is None:
+            self._commit()
+        else:
+            self._rollback()
+
+    async def __aenter__(self) -> Self:
+        """Start the transaction, or join the one already entered on the session."""
+        return self._enter()
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Commit the transaction, or roll it back when the block raised, without blocking the event loop."""
+        if not self._leave():
+            return
+        await asyncio.to_thread(self._commit if exc_type is None else self._rollback)
+
+    def after_commit(self, callback: Callable[[], object]) -> None:
+        """Call `callback` once the transaction committed, it is dropped when the transaction rolls back."""
+        self._callbacks.append(callback)
+
+    def _enter(self) -> Self:
+        self._joined = current_transaction(self.session) is not None
+        self._token = _transactions.set((*_transactions.get(), self))
+        return self
+
+    def _leave(self) -> bool:
+        """Stop being the current transaction, returning whether this transaction has to commit or roll back."""
+        if self._token is not None:
+            _transactions.reset(self._token)
+            self._token = None
+        return not self._joined
+
+    def _commit(self) -> None:
+        try:
+            self.session.commit()
+        except BaseException:
+            self._rollback()
+            raise
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def _rollback(self) -> None:
+        self._callbacks.clear()
+        self.session.rollback()
+
+
+class AsyncTransaction(Transaction):
+    """A transaction on an `AsyncSession`, only usable with `async with`.
+
+    With `close` the session is closed once the transaction committed or rolled back.
+    """
+
+    session: AsyncSession  # pyright: ignore[reportIncompatibleVariableOverride]
+
+    def __init__(self, session: AsyncSession, *, close: bool = False) -> None:
+        """Initialize a transaction on the session, starting once entered."""
+        super().__init__(session)  # pyright: ignore[reportArgumentType]
+        self.close = close
+
+    def __enter__(self) -> Self:
+        """Refuse to start, committing an `AsyncSession` has to be awaited."""
+        msg = "Use `async with` for transactions on an AsyncSession."
+        raise TypeError(msg)
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Commit the transaction, or roll it back when the block raised."""
+        if not self._leave():
+            return
+        try:
+            if exc_type is None:
+                await self._commit_async()
+            else:
+                await self._rollback_async()
+        finally:
+            if self.close:
+                await self.session.close()
+
+    async def _commit_async(self) -> None:
+        try:
+            await self.session.commit()
+        except BaseException:
+            await self._rollback_async()
+            raise
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    async def _rollback_async(self) -> None:
+        self._callbacks.clear()
+        await self.session.rollback()
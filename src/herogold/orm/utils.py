@@ -9,6 +9,10 @@ from sqlmodel import SQLModel
 from herogold.sentinel import create_sentinel
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from sqlmodel import Session
+
     # Imported for typing only: ``BaseModel`` appears solely in (stringized)
     # annotations and the lazily-evaluated PEP 695 bound ``Relationship[T: BaseModel]``.
     # Importing it at runtime creates a circular import (model -> utils -> model).
@@ -134,3 +138,22 @@ class Relationship[T: BaseModel]:
     def _get_optional(self, instance: BaseModel, foreign_key: str) -> T | None:
         """Return value stored in ``foreign_key`` attribute (may be ``None``)."""
         return getattr(instance, foreign_key)
+
+
+def prefetch[T: BaseModel](instances: Sequence[BaseModel], relation: str, session: Session | None = None) -> dict[int, T]:
+    """Load the related records of a relationship for every instance in one query per chunk, returning them by id.
+
+    Accessing the relationship on the instances afterwards is served from the identity map of the related model.
+    """
+    if not instances:
+        return {}
+    descriptor = next(
+        (vars(klass)[relation] for klass in type(instances[0]).__mro__ if relation in vars(klass)),
+        None,
+    )
+    if not isinstance(descriptor, Relationship):
+        msg = f"{type(instances[0]).__name__}.{relation} is not a relationship."
+        raise TypeError(msg)
+    foreign_key = f"{relation}_id"
+    ids = [key for instance in instances if isinstance(key := getattr(instance, foreign_key, None), int)]
+    return descriptor.related_model.get_many(ids, session)
@@ -0,0 +1,27 @@
+"""Workers for handling background tasks."""
+
+from __future__ import annotations
+
+from .backends import BackendName
+from .errors import WorkerDiedError
+from .health import WorkerStats
+from .metrics import MetricsRecorder, TaskHook, TaskMetrics
+from .pool import Action, AsyncWorkerPool, BaseWorkerPool, PoolOptions, WorkerPool
+from .scheduler import Scheduler
+from .shared_memory import SharedBuffer
+
+__all__ = [
+    "Action",
+    "AsyncWorkerPool",
+    "BackendName",
+    "BaseWorkerPool",
+    "MetricsRecorder",
+    "PoolOptions",
+    "Scheduler",
+    "SharedBuffer",
+    "TaskHook",
+    "TaskMetrics",
+    "WorkerDiedError",
+    "WorkerPool",
+    "WorkerStats",
+]
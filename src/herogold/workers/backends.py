@@ -0,0 +1,173 @@
+"""Backends that run the workers of a pool as processes, threads or subinterpreters.
+
+Every backend mimics the part of a `multiprocessing` context used by the pools,
+so `multiprocessing.get_context("spawn")` is itself the process backend.
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import queue
+import sys
+import threading
+from typing import TYPE_CHECKING, Any, Literal, Protocol
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, MutableSequence
+
+type BackendName = Literal["process", "thread", "interpreter"]
+"""Where the workers of a pool run.
+
+- `process`: spawned processes, fully isolated, every task and result is pickled.
+- `thread`: threads of this process, nothing is pickled. Suited to I/O-bound actions and free-threaded builds.
+- `interpreter`: subinterpreters on Python 3.14+, isolated like processes but started much faster.
+"""
+
+
+class WorkerHandle(Protocol):
+    """The part of `multiprocessing.Process` used to manage a worker."""
+
+    @property
+    def pid(self) -> int | None: ...  # noqa: D102
+
+    @property
+    def exitcode(self) -> int | None: ...  # noqa: D102
+
+    def start(self) -> None: ...  # noqa: D102
+
+    def join(self, timeout: float | None = None) -> None: ...  # noqa: D102
+
+    def is_alive(self) -> bool: ...  # noqa: D102
+
+    def terminate(self) -> None: ...  # noqa: D102
+
+
+class Backend(Protocol):
+    """The part of a `multiprocessing` context used to create the queues, shared state and workers of a pool."""
+
+    def Queue(self) -> Any: ...  # noqa: ANN401, D102, N802
+
+    def Array(self, typecode: str, initializer: list[int], *, lock: bool) -> Any: ...  # noqa: ANN401, D102, N802
+
+    def Process(self, *, target: Callable[..., object], args: tuple[Any, ...]) -> Any: ...  # noqa: ANN401, D102, N802
+
+
+class _WorkerThread(threading.Thread):
+    """A worker running in a thread, exiting with 1 when the worker loop itself raised."""
+
+    def __init__(self, target: Callable[..., object], args: tuple[Any, ...]) -> None:
+        super().__init__(target=target, args=args, daemon=True)
+        self._failed = False
+
+    @property
+    def pid(self) -> int | None:
+        return os.getpid()
+
+    @property
+    def exitcode(self) -> int | None:
+        if self.ident is None or self.is_alive():
+            return None
+        return int(self._failed)
+
+    def run(self) -> None:
+        try:
+            super().run()
+        except BaseException:
+            self._failed = True
+            raise
+
+    def terminate(self) -> None:
+        """Threads can't be killed, the pool sends an exit signal after its queued chunks instead."""
+
+
+class ThreadBackend:
+    """Runs workers as threads of this process."""
+
+    def Queue(self) -> queue.Queue[Any]:  # noqa: D102, N802
+        return queue.Queue()
+
+    def Array(self, typecode: str, initializer: list[int], *, lock: bool) -> MutableSequence[int]:  # noqa: ARG002, D102, N802
+        return list(initializer)
+
+    def Process(self, *, target: Callable[..., object], args: tuple[Any, ...]) -> _WorkerThread:  # noqa: D102, N802
+        return _WorkerThread(target, args)
+
+
+class _WorkerInterpreter:
+    """A worker running in its own subinterpreter, on a thread of this process."""
+
+    def __init__(self, target: Callable[..., object], args: tuple[Any, ...]) -> None:
+        self._target = target
+        self._args = args
+        self._thread: threading.Thread | None = None
+
+    @property
+    def pid(self) -> int | None:
+        return os.getpid()
+
+    @property
+    def exitcode(self) -> int | None:
+        if self._thread is None or self._thread.is_alive():
+            return None
+        return 0
+
+    def start(self) -> None:
+        from concurrent import interpreters  # noqa: PLC0415 # Only available on 3.14+.
+
+        interpreter = interpreters.create()
+
+        def run() -> None:
+            try:
+                interpreter.call(self._target, *self._args)
+            finally:
+                interpreter.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def join(self, timeout: float | None = None) -> None:
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def terminate(self) -> None:
+        """Subinterpreters can't be killed, the pool sends an exit signal after its queued chunks instead."""
+
+
+class InterpreterBackend:
+    """Runs workers in subinterpreters, using `concurrent.interpreters` queues to talk to them.
+
+    A subinterpreter can't crash on its own without taking the process down,
+    so the in-flight bookkeeping used to fail the tasks of dead workers stays local to the pool.
+    """
+
+    def __init__(self) -> None:
+        """Check that subinterpreters are available."""
+        if sys.version_info < (3, 14):
+            msg = "The interpreter backend needs concurrent.interpreters, available from Python 3.14."
+            raise RuntimeError(msg)
+
+    def Queue(self) -> Any:  # noqa: ANN401, D102, N802
+        from concurrent import interpreters  # noqa: PLC0415 # Only available on 3.14+.
+
+        return interpreters.create_queue()
+
+    def Array(self, typecode: str, initializer: list[int], *, lock: bool) -> MutableSequence[int]:  # noqa: ARG002, D102, N802
+        return list(initializer)
+
+    def Process(self, *, target: Callable[..., object], args: tuple[Any, ...]) -> _WorkerInterpreter:  # noqa: D102, N802
+        return _WorkerInterpreter(target, args)
+
+
+def get_backend(name: BackendName) -> Backend:
+    """Return the backend with the given name."""
+    match name:
+        case "process":
+            return mp.get_context("spawn")
+        case "thread":
+            return ThreadBackend()
+        case "interpreter":
+            return InterpreterBackend()
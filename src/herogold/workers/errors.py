@@ -0,0 +1,7 @@
+"""Module with custom exceptions for the workers package."""
+
+from __future__ import annotations
+
+
+class WorkerDiedError(RuntimeError):
+    """Custom exception for tasks lost because the worker running them died."""
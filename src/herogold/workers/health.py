@@ -0,0 +1,62 @@
+"""Health checks and counters for the workers of a pool."""
+
+from __future__ import annotations
+
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+_STATM = Path("/proc/self/statm")
+
+
+def current_rss() -> int:
+    """Return the resident set size of this process in bytes, or 0 when it can't be measured.
+
+    Reads `/proc/self/statm` where available, otherwise falls back on the peak RSS reported by `resource`.
+    """
+    try:
+        return int(_STATM.read_text().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024  # Reported in kilobytes, except on macOS.
+
+
+class WorkerLimits(NamedTuple):
+    """Limits after which a worker retires, to be replaced by a fresh process."""
+
+    max_tasks: int | None = None
+    max_memory: int | None = None
+    """Resident set size in bytes."""
+
+    def exceeded(self, tasks_done: int, rss: int) -> bool:
+        """Return whether a worker with these counters should retire."""
+        if self.max_tasks is not None and tasks_done >= self.max_tasks:
+            return True
+        return self.max_memory is not None and rss > self.max_memory
+
+
+@dataclass(slots=True)
+class WorkerStats:
+    """Counters for one worker slot of a pool, carried over when its process is replaced."""
+
+    slot: int
+    pid: int | None = None
+    alive: bool = False
+    tasks_done: int = 0
+    busy_seconds: float = 0.0
+    rss: int = 0
+    """Resident set size in bytes, as last reported by the worker."""
+    restarts: int = 0
+    crashes: int = 0
+    last_active: float = 0.0
+    """`time.monotonic` of the worker's last finished chunk, or of its start."""
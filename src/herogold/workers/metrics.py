@@ -0,0 +1,100 @@
+"""Per-task timings and payload sizes, reported by worker pools and parallel loops to a hook."""
+
+from __future__ import annotations
+
+import math
+import pickle
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Sequence
+
+
+@dataclass(frozen=True, slots=True)
+class TaskMetrics:
+    """Timings of a single task, as `time.time` timestamps so they compare across processes."""
+
+    task_id: int
+    enqueued: float
+    started: float
+    finished: float
+    succeeded: bool
+    payload_bytes: int | None = None
+    """Pickled size of the task sent to the worker, None when it couldn't be pickled."""
+    result_bytes: int | None = None
+    """Pickled size of the return value or raised exception, None when it couldn't be pickled."""
+
+    @property
+    def queued_seconds(self) -> float:
+        """Return how long the task waited before a worker started it."""
+        return self.started - self.enqueued
+
+    @property
+    def run_seconds(self) -> float:
+        """Return how long the worker spent running the task."""
+        return self.finished - self.started
+
+
+type TaskHook = Callable[[TaskMetrics], object]
+"""Called with the metrics of every finished task, from a background thread of the parent process."""
+
+
+def pickled_size(value: object) -> int | None:
+    """Return the size of `value` once pickled, or None when it can't be pickled."""
+    try:
+        return len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+    except Exception:  # noqa: BLE001 # Anything can be raised by a custom __reduce__.
+        return None
+
+
+def _percentile(values: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of sorted `values`."""
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+
+class MetricsRecorder:
+    """A task hook that keeps every reported `TaskMetrics`, to summarize them afterwards."""
+
+    def __init__(self) -> None:
+        """Initialize an empty recorder."""
+        self.records: list[TaskMetrics] = []
+        self._lock = threading.Lock()
+
+    def __call__(self, metrics: TaskMetrics) -> None:
+        """Record the metrics of a finished task."""
+        with self._lock:
+            self.records.append(metrics)
+
+    def __len__(self) -> int:
+        """Return the number of recorded tasks."""
+        return len(self.records)
+
+    def clear(self) -> None:
+        """Forget every recorded task."""
+        with self._lock:
+            self.records.clear()
+
+    def summary(self) -> dict[str, float]:
+        """Return totals, throughput and queue/run latency percentiles of the recorded tasks."""
+        with self._lock:
+            records = list(self.records)
+        if not records:
+            return {"tasks": 0}
+        queued = sorted(record.queued_seconds for record in records)
+        run = sorted(record.run_seconds for record in records)
+        elapsed = max(record.finished for record in records) - min(record.enqueued for record in records)
+        return {
+            "tasks": len(records),
+            "failed": sum(not record.succeeded for record in records),
+            "tasks_per_second": len(records) / elapsed if elapsed > 0 else math.inf,
+            "queued_mean": sum(queued) / len(queued),
+            "queued_p50": _percentile(queued, 0.5),
+            "queued_p95": _percentile(queued, 0.95),
+            "run_mean": sum(run) / len(run),
+            "run_p50": _percentile(run, 0.5),
+            "run_p95": _percentile(run, 0.95),
+            "payload_bytes": sum(record.payload_bytes or 0 for record in records),
+            "result_bytes": sum(record.result_bytes or 0 for record in records),
+        }
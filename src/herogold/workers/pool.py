@@ -0,0 +1,677 @@
+"""Pools of worker processes that run actions in the background."""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import pickle
+import signal
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator, AsyncIterator, Awaitable, Callable, Generator, Iterable, Iterator
+from concurrent import futures
+from concurrent.futures import Future
+from dataclasses import replace
+from queue import SimpleQueue
+from typing import TYPE_CHECKING, NamedTuple, Self, TypedDict, Unpack, cast
+
+from herogold.log import getLogger
+from herogold.sentinel import create_sentinel
+
+from .backends import Backend, BackendName, WorkerHandle, get_backend
+from .errors import WorkerDiedError
+from .health import WorkerLimits, WorkerStats, current_rss
+from .metrics import TaskHook, TaskMetrics, pickled_size
+from .scheduler import Dispatcher, Scheduler, next_batch
+from .shared_memory import SharedBuffer, SharedMemoryRegistry
+
+if TYPE_CHECKING:
+    import multiprocessing as mp
+    from collections.abc import Buffer, MutableSequence, Sequence
+    from multiprocessing.queues import Queue
+    from types import FrameType, TracebackType
+
+type Action = Callable[[], object]
+type _Task = tuple[int, Action]
+type _Outcome = tuple[int, bool, object]
+"""The task id, whether the action succeeded, and its return value or raised exception."""
+type _Timing = tuple[float, float, int | None]
+"""When a task started and finished, and the pickled size of its outcome."""
+type _AnyFuture = Future[object] | asyncio.Future[object]
+
+_IDLE = create_sentinel()
+"""Wakes up result streams when the last pending task has been settled."""
+_PREFETCH = 2
+"""Chunks handed to a worker ahead of time, so it never waits on the dispatcher between chunks."""
+_MONITOR_INTERVAL = 0.1
+"""Seconds between liveness checks of the worker processes."""
+_SLOT_WIDTH = 3
+"""Values per worker in the in-flight array: the queue, first task id and task count of its current chunk."""
+
+_log = getLogger(__name__)
+
+
+class PoolOptions(TypedDict, total=False):
+    """Keyword options shared by every worker pool, see `BaseWorkerPool`."""
+
+    backend: BackendName
+    scheduler: Scheduler
+    max_tasks_per_worker: int | None
+    max_memory_per_worker: int | None
+    min_size: int | None
+    max_size: int | None
+    idle_timeout: float
+    on_task: TaskHook | None
+
+
+class _Report(NamedTuple):
+    """A finished chunk, as sent back by a worker."""
+
+    queue: int
+    slot: int
+    outcomes: list[_Outcome]
+    busy_seconds: float
+    rss: int
+    timings: list[_Timing] | None = None
+    """Per task timings, only measured for pools with an `on_task` hook."""
+
+
+def _run(task_id: int, action: Action) -> _Outcome:
+    try:
+        return task_id, True, action()
+    except BaseException as exc:  # noqa: BLE001
+        return task_id, False, exc
+
+
+def _dump(outcome: _Outcome) -> _Outcome:
+    """Pickle the value of an outcome, failing the task with a `PicklingError` when its value can't be pickled.
+
+    Pickled by the worker rather than the queue, which drops the whole chunk when one of its values fails to pickle.
+    """
+    task_id, succeeded, value = outcome
+    try:
+        return task_id, succeeded, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+    except Exception as exc:  # noqa: BLE001 # Anything can be raised by a custom __reduce__.
+        error = pickle.PicklingError(f"The outcome of task {task_id} can't be pickled: {exc!r}")
+        return task_id, False, pickle.dumps(error, pickle.HIGHEST_PROTOCOL)
+
+
+def _load(outcome: _Outcome) -> _Outcome:
+    """Unpickle the value of an outcome pickled by `_dump`, failing the task when it can't be unpickled."""
+    task_id, succeeded, data = outcome
+    try:
+        return task_id, succeeded, pickle.loads(cast("bytes", data))  # noqa: S301 # Pickled by our own workers.
+    except Exception as exc:  # noqa: BLE001 # Anything can be raised by unpickling, like a missing __init__ argument.
+        return task_id, False, pickle.UnpicklingError(f"The outcome of task {task_id} can't be unpickled: {exc!r}")
+
+
+def _run_measured(batch: list[_Task]) -> tuple[list[_Outcome], list[_Timing]]:
+    """Run a chunk like `_run`, timing every task and measuring the pickled size of its outcome."""
+    outcomes: list[_Outcome] = []
+    timings: list[_Timing] = []
+    for task_id, action in batch:
+        started = time.time()
+        outcome = _run(task_id, action)
+        finished = time.time()
+        outcomes.append(outcome)
+        timings.append((started, finished, pickled_size(outcome[2])))
+    return outcomes, timings
+
+
+def _worker(  # noqa: PLR0913, PLR0917
+    slot: int,
+    task_queues: Sequence[Queue[list[_Task] | None]],
+    result_q: Queue[_Report | None],
+    in_flight: MutableSequence[int],
+    limits: WorkerLimits,
+    measure: bool,  # noqa: FBT001
+    pickled: bool,  # noqa: FBT001
+) -> None:
+    offset = slot * _SLOT_WIDTH
+    tasks_done = 0
+    while True:
+        source, batch = next_batch(slot % len(task_queues), task_queues)
+        if batch is None:
+            return
+        in_flight[offset], in_flight[offset + 1], in_flight[offset + 2] = source, batch[0][0], len(batch)
+        start = time.perf_counter()
+        if measure:
+            outcomes, timings = _run_measured(batch)
+        else:
+            outcomes, timings = [_run(task_id, action) for task_id, action in batch], None
+        busy = time.perf_counter() - start
+        if pickled:
+            outcomes = [_dump(outcome) for outcome in outcomes]
+        tasks_done += len(batch)
+        rss = current_rss()
+        result_q.put(_Report(source, slot, outcomes, busy, rss, timings))
+        in_flight[offset + 2] = 0
+        if limits.exceeded(tasks_done, rss):
+            return
+
+
+class BaseWorkerPool(ABC):
+    """Base class for worker pools."""
+
+    size: int
+    ctx: Backend
+
+    def __init__(  # noqa: PLR0913
+        self,
+        size: int = 1,
+        ctx: mp.context.SpawnContext | None = None,
+        *,
+        backend: BackendName = "process",
+        scheduler: Scheduler = "shared",
+        max_tasks_per_worker: int | None = None,
+        max_memory_per_worker: int | None = None,
+        min_size: int | None = None,
+        max_size: int | None = None,
+        idle_timeout: float = 30.0,
+        on_task: TaskHook | None = None,
+    ) -> None:
+        """Initialize the worker pool with the given size and multiprocessing context.
+
+        The `backend` picks whether workers are processes, threads or subinterpreters,
+        a multiprocessing context can only be given for the process backend.
+        With the `stealing` scheduler every worker gets its own queue, avoiding contention on a single shared one.
+        A worker is replaced by a fresh process once it has run `max_tasks_per_worker` tasks,
+        or its resident memory grew beyond `max_memory_per_worker` bytes, checked between chunks.
+        Workers that die are replaced too, failing the tasks they were running with `WorkerDiedError`.
+
+        Giving `min_size` or `max_size` lets the pool scale between them, starting at `size` workers.
+        Workers are added while chunks wait for a free worker,
+        and retired once they have been idle for `idle_timeout` seconds.
+
+        An `on_task` hook is called with the `TaskMetrics` of every finished task, from the result collector thread.
+        Measuring them pickles every action and outcome once more, so only pass a hook while profiling.
+        """
+        min_size = size if min_size is None else min_size
+        max_size = size if max_size is None else max_size
+        if not 0 <= min_size <= size <= max_size:
+            msg = f"Expected 0 <= min_size <= size <= max_size, got {min_size}, {size}, {max_size}"
+            raise ValueError(msg)
+        if ctx is not None and backend != "process":
+            msg = f"A multiprocessing context can't be used with the {backend} backend."
+            raise ValueError(msg)
+        if scheduler == "stealing" and min_size != max_size:
+            msg = "Autoscaling needs the shared scheduler, stealing pools have a queue per worker."
+            raise ValueError(msg)
+        self.size = size
+        self.min_size = min_size
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.backend = backend
+        self.ctx = ctx or get_backend(backend)
+        self._pickled = backend == "process"
+        """Whether workers pickle the outcomes of their tasks, for backends that can't share objects."""
+        self.scheduler = scheduler
+        queue_count = size if scheduler == "stealing" else 1
+        self._task_queues: list[Queue[list[_Task] | None]] = [self.ctx.Queue() for _ in range(queue_count)]
+        self._dispatcher = Dispatcher(self._task_queues, capacity=_PREFETCH * size // max(queue_count, 1))
+        self._results: Queue[_Report | None] = self.ctx.Queue()
+        self._limits = WorkerLimits(max_tasks_per_worker, max_memory_per_worker)
+        self._in_flight = cast("MutableSequence[int]", self.ctx.Array("q", [0] * (max_size * _SLOT_WIDTH), lock=False))
+        self._stats = [WorkerStats(slot) for slot in range(max_size)]
+        self._stats_lock = threading.Lock()
+        self._monitor: threading.Thread | None = None
+        self._stop_monitor = threading.Event()
+        self._retiring = 0
+        self._errors: SimpleQueue[BaseException] = SimpleQueue()
+        self._futures: dict[int, _AnyFuture] = {}
+        self._futures_lock = threading.Lock()
+        self._task_ids = itertools.count()
+        self._collector: threading.Thread | None = None
+        self._processes: dict[int, WorkerHandle] = {}
+        self._shared = SharedMemoryRegistry()
+        self._on_task = on_task
+        self._enqueued: dict[int, tuple[float, int | None]] = {}
+        """Enqueue time and pickled size of every pending task, only kept for pools with an `on_task` hook."""
+        self._setup_signal_handlers()
+
+    def _setup_signal_handlers(self) -> None:
+        """Register signal handlers to close on SIGTERM/SIGINT."""
+
+        def _handle_signal(_signum: int, _frame: FrameType | None) -> None:
+            self.close()
+
+        signal.signal(signal.SIGTERM, _handle_signal)
+        signal.signal(signal.SIGINT, _handle_signal)
+
+    def start(self) -> None:
+        """Start the worker processes if they haven't been started already."""
+        if self._collector is not None:
+            return
+        self._collector = threading.Thread(target=self._collect_results, name="WorkerPool-results", daemon=True)
+        self._collector.start()
+        self._dispatcher.start()
+        self._processes = {slot: self._spawn(slot) for slot in range(self.size)}
+        self._stop_monitor.clear()
+        self._monitor = threading.Thread(target=self._monitor_workers, name="WorkerPool-monitor", daemon=True)
+        self._monitor.start()
+
+    def _spawn(self, slot: int) -> WorkerHandle:
+        """Start a worker process for the given slot."""
+        process = cast(
+            "WorkerHandle",
+            self.ctx.Process(
+                target=_worker,
+                args=(
+                    slot,
+                    self._task_queues,
+                    self._results,
+                    self._in_flight,
+                    self._limits,
+                    self._on_task is not None,
+                    self._pickled,
+                ),
+            ),
+        )
+        process.start()
+        with self._stats_lock:
+            self._stats[slot].pid = process.pid
+            self._stats[slot].last_active = time.monotonic()
+        return process
+
+    def stats(self) -> list[WorkerStats]:
+        """Return a snapshot of the counters of every worker slot that has been used."""
+        with self._stats_lock:
+            return [
+                replace(stats, alive=(process := self._processes.get(slot)) is not None and process.is_alive())
+                for slot, stats in enumerate(self._stats)
+                if stats.pid is not None
+            ]
+
+    def _monitor_workers(self) -> None:
+        """Replace worker processes that exited and scale the pool, runs in a background thread of the parent process."""
+        while not self._stop_monitor.wait(_MONITOR_INTERVAL):
+            for slot, process in list(self._processes.items()):
+                if not process.is_alive():
+                    self._reap(slot, process)
+            if self.min_size != self.max_size:
+                self._autoscale()
+
+    def _reap(self, slot: int, process: WorkerHandle) -> None:
+        """Fail the chunk a dead worker was running, and start a new worker in its slot unless it was retired."""
+        process.join()
+        del self._processes[slot]
+        crashed = self._fail_in_flight(slot, process.exitcode)
+        if self._retiring and not crashed:
+            self._retiring -= 1
+            return
+        with self._stats_lock:
+            self._stats[slot].restarts += 1
+            self._stats[slot].crashes += crashed
+        self._processes[slot] = self._spawn(slot)
+
+    def _autoscale(self) -> None:
+        """Add workers while chunks wait for one, and retire workers that have been idle for too long."""
+        active = len(self._processes) - self._retiring
+        if backlog := self._dispatcher.backlog:
+            free_slots = (slot for slot in range(self.max_size) if slot not in self._processes)
+            for slot in itertools.islice(free_slots, min(self.max_size - active, math.ceil(backlog / _PREFETCH))):
+                self._processes[slot] = self._spawn(slot)
+                active += 1
+        else:
+            idle_since = time.monotonic() - self.idle_timeout
+            with self._stats_lock:
+                idle = sum(
+                    not self._in_flight[slot * _SLOT_WIDTH + 2] and self._stats[slot].last_active < idle_since
+                    for slot in self._processes
+                )
+            for _ in range(min(idle - self._retiring, active - self.min_size)):
+                self._retiring += 1
+                active -= 1
+                self._task_queues[0].put(None)  # Taken by whichever worker is idle.
+        self.size = active
+        self._dispatcher.resize(_PREFETCH * active)
+
+    def _fail_in_flight(self, slot: int, exitcode: int | None) -> bool:
+        """Fail the tasks of the chunk the worker in `slot` was running, returning whether there were any."""
+        offset = slot * _SLOT_WIDTH
+        source, first, count = self._in_flight[offset : offset + _SLOT_WIDTH]
+        if not count:
+            return False
+        self._in_flight[offset + 2] = 0
+        msg = f"Worker {slot} died with exit code {exitcode} while running this task."
+        self._dispatcher.done(source)
+        with self._futures_lock:
+            for task_id in range(first, first + count):
+                self._enqueued.pop(task_id, None)
+        self._settle([(task_id, False, WorkerDiedError(msg)) for task_id in range(first, first + count)])
+        return True
+
+    def close(self, *, force: bool = False) -> None:
+        """Signal the worker processes to exit and wait for them to finish."""
+        self._shutdown(force=force)
+        self._abandon_pending()
+        self._shared.clear()
+
+    def _queue_index(self, worker: int) -> int:
+        """Return the index of the queue a worker takes its chunks from."""
+        return worker % len(self._task_queues)
+
+    def _shutdown(self, *, force: bool = False) -> None:
+        """Stop the worker processes, then the result collector once every result has been read."""
+        self._dispatcher.stop(discard=force)
+        if self._monitor is not None:
+            self._stop_monitor.set()
+            self._monitor.join()
+            self._monitor = None
+        if force:
+            for p in self._processes.values():
+                if p.is_alive():
+                    p.terminate()
+        for slot in self._processes:  # Threads and subinterpreters can't be terminated, they exit on this instead.
+            self._task_queues[self._queue_index(slot)].put(None)
+        for p in self._processes.values():
+            p.join()
+        if self._collector is not None:
+            self._results.put(None)
+            self._collector.join()
+            self._collector = None
+
+    def share(self, data: Buffer) -> SharedBuffer:
+        """Copy `data` into shared memory owned by the pool, returning a handle to pass to actions.
+
+        Workers read the buffer through `SharedBuffer.open` without it being pickled and piped.
+        The memory is unlinked when the pool closes, or earlier with `release`.
+        """
+        return self._shared.share(data)
+
+    def allocate(self, size: int) -> SharedBuffer:
+        """Create `size` bytes of zero-filled shared memory owned by the pool, for workers to write into."""
+        return self._shared.allocate(size)
+
+    def release(self, buffer: SharedBuffer) -> None:
+        """Unlink a shared buffer before the pool closes, once no action will use it anymore."""
+        self._shared.release(buffer)
+
+    def _abandon_pending(self) -> None:
+        """Cancel the futures of tasks that will never be resolved."""
+        with self._futures_lock:
+            abandoned = list(self._futures.values())
+            self._futures.clear()
+            self._enqueued.clear()
+        for future in abandoned:
+            future.cancel()
+
+    def _collect_results(self) -> None:
+        """Read finished chunks from the workers, runs in a background thread of the parent process."""
+        while (report := self._results.get()) is not None:
+            if self._pickled:
+                report = report._replace(outcomes=[_load(outcome) for outcome in report.outcomes])
+            self._dispatcher.done(report.queue)
+            with self._stats_lock:
+                stats = self._stats[report.slot]
+                stats.tasks_done += len(report.outcomes)
+                stats.busy_seconds += report.busy_seconds
+                stats.rss = report.rss
+                stats.last_active = time.monotonic()
+            self._settle(report.outcomes)
+            if report.timings is not None:
+                self._report_metrics(report.outcomes, report.timings)
+
+    def _report_metrics(self, outcomes: list[_Outcome], timings: list[_Timing]) -> None:
+        """Pass the metrics of a finished chunk to the `on_task` hook."""
+        if self._on_task is None:
+            return
+        for (task_id, succeeded, _), (started, finished, result_bytes) in zip(outcomes, timings, strict=True):
+            with self._futures_lock:
+                enqueued, payload_bytes = self._enqueued.pop(task_id, (started, None))
+            try:
+                self._on_task(TaskMetrics(task_id, enqueued, started, finished, succeeded, payload_bytes, result_bytes))
+            except Exception:  # noqa: BLE001 # A failing hook must not stop the collector.
+                _log.exception("The on_task hook of a worker pool failed.")
+
+    def _settle(self, outcomes: list[_Outcome]) -> None:
+        """Resolve the futures of a finished chunk, called from the collector thread."""
+        for task_id, succeeded, value in outcomes:
+            with self._futures_lock:
+                future = self._futures.pop(task_id, None)
+            if future is None or future.done():
+                continue
+            if succeeded:
+                future.set_result(value)
+            else:
+                exc = cast("BaseException", value)
+                self._errors.put(exc)
+                future.set_exception(exc)
+
+    def _new_future(self) -> _AnyFuture:
+        """Create the future handed out for a single task."""
+        return Future()
+
+    def _enqueue(self, actions: Iterable[Action], chunksize: int | None = None, priority: int = 0) -> list[_AnyFuture]:
+        """Send the actions to the workers in chunks, returning one future per action."""
+        actions = list(actions)
+        if chunksize is None:
+            chunksize = self._default_chunksize(len(actions))
+        if chunksize < 1:
+            msg = f"chunksize must be at least 1, got {chunksize}"
+            raise ValueError(msg)
+
+        submitted: list[_AnyFuture] = []
+        for chunk in itertools.batched(actions, chunksize):
+            batch: list[_Task] = []
+            sizes = [pickled_size(action) for action in chunk] if self._on_task is not None else None
+            with self._futures_lock:
+                for index, action in enumerate(chunk):
+                    future = self._new_future()
+                    task_id = next(self._task_ids)
+                    self._futures[task_id] = future
+                    if sizes is not None:
+                        self._enqueued[task_id] = (time.time(), sizes[index])
+                    batch.append((task_id, action))
+                    submitted.append(future)
+            self._dispatcher.push(batch, priority)
+        return submitted
+
+    def _default_chunksize(self, count: int) -> int:
+        """Split the actions into roughly four chunks per worker, like `multiprocessing.Pool.map`."""
+        return max(1, math.ceil(count / (max(self.size, 1) * 4)))
+
+    def _pending(self) -> list[_AnyFuture]:
+        """Return the futures of all tasks that have not finished yet."""
+        with self._futures_lock:
+            return list(self._futures.values())
+
+    def _drain(self) -> None:
+        """Block until every submitted task has finished and its future is resolved."""
+        futures.wait(cast("list[Future[object]]", self._pending()))
+
+    @abstractmethod
+    def submit(self, action: Action, *, priority: int = 0) -> Future[object] | Awaitable[asyncio.Future[object]]:
+        """Submit a task to be executed by the worker processes."""
+
+    @abstractmethod
+    def submit_many(
+        self,
+        actions: Iterable[Action],
+        chunksize: int | None = None,
+        *,
+        priority: int = 0,
+    ) -> list[Future[object]] | Awaitable[list[asyncio.Future[object]]]:
+        """Submit many tasks, sending them to the worker processes in chunks."""
+
+    @abstractmethod
+    def pop_errors(self) -> Iterator[BaseException] | AsyncIterator[BaseException]:
+        """Retrieve all errors that occurred during task execution."""
+
+    @abstractmethod
+    def wait(self) -> None | Awaitable[None]:
+        """Wait for all worker processes to finish."""
+
+
+class WorkerPool(BaseWorkerPool):
+    """A pool of worker processes for handling background tasks."""
+
+    def __enter__(self) -> Self:
+        """Context manager entry."""
+        self.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Context manager exit — close on exit."""
+        self.close(force=exc_type is not None)
+
+    def submit[T](self, action: Callable[[], T], *, priority: int = 0) -> Future[T]:
+        """Submit a task to be executed by the worker processes, returning a future for its result.
+
+        Tasks with a higher priority are handed to the workers before those waiting with a lower one.
+        """
+        return cast("Future[T]", self._enqueue([action], chunksize=1, priority=priority)[0])
+
+    def submit_many[T](
+        self,
+        actions: Iterable[Callable[[], T]],
+        chunksize: int | None = None,
+        *,
+        priority: int = 0,
+    ) -> list[Future[T]]:
+        """Submit many tasks, sending `chunksize` actions per queue message.
+
+        When no chunksize is given, the actions are split into about four chunks per worker.
+        The returned futures are in the same order as the actions.
+        """
+        return cast("list[Future[T]]", self._enqueue(actions, chunksize, priority))
+
+    def pop_errors(self) -> Generator[BaseException]:
+        """Retrieve all errors that occurred during task execution."""
+        while not self._errors.empty():
+            yield self._errors.get()
+
+    def wait(self) -> None:
+        """Wait for all submitted tasks to finish."""
+        self._drain()
+
+
+class AsyncWorkerPool(BaseWorkerPool):
+    """A pool of worker processes for handling background tasks from async code.
+
+    Results are handed to the event loop by the collector thread,
+    so no method blocks the loop while tasks run.
+    """
+
+    def __init__(
+        self,
+        size: int = 1,
+        ctx: mp.context.SpawnContext | None = None,
+        **options: Unpack[PoolOptions],
+    ) -> None:
+        """Initialize the worker pool with the given size and multiprocessing context, see `BaseWorkerPool`."""
+        super().__init__(size, ctx, **options)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._async_errors: asyncio.Queue[BaseException] = asyncio.Queue()
+        self._streams: set[asyncio.Queue[object]] = set()
+
+    async def __aenter__(self) -> Self:
+        """Context manager entry."""
+        self._loop = asyncio.get_running_loop()
+        self.start()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        """Context manager exit — close on exit."""
+        await self.aclose(force=exc_type is not None)
+
+    async def aclose(self, *, force: bool = False) -> None:
+        """Close the pool like `close`, waiting for the worker processes in a thread instead of on the loop."""
+        await asyncio.to_thread(self._shutdown, force=force)
+        self._abandon_pending()
+        self._shared.clear()
+
+    def _new_future(self) -> asyncio.Future[object]:
+        if self._loop is None:
+            self._loop = asyncio.get_running_loop()
+        return self._loop.create_future()
+
+    def _settle(self, outcomes: list[_Outcome]) -> None:
+        """Hand a finished chunk to the event loop, one callback per chunk rather than per task."""
+        if self._loop is not None:  # Set by the first submit, so always there when tasks finish.
+            self._loop.call_soon_threadsafe(self._settle_in_loop, outcomes)
+
+    def _settle_in_loop(self, outcomes: list[_Outcome]) -> None:
+        for task_id, succeeded, value in outcomes:
+            with self._futures_lock:
+                future = self._futures.pop(task_id, None)
+            if future is None or future.done():
+                continue
+            if succeeded:
+                future.set_result(value)
+                for stream in self._streams:
+                    stream.put_nowait(value)
+            else:
+                exc = cast("BaseException", value)
+                self._async_errors.put_nowait(exc)
+                future.set_exception(exc)
+                future.exception()  # Retrieved through pop_errors, don't warn about it never being awaited.
+        if not self._futures:
+            self._wake_streams()
+
+    def _abandon_pending(self) -> None:
+        super()._abandon_pending()
+        self._wake_streams()
+
+    def _wake_streams(self) -> None:
+        """Let every `results` iterator re-check whether tasks are still pending."""
+        for stream in self._streams:
+            stream.put_nowait(_IDLE)
+
+    async def submit[T](self, action: Callable[[], T], *, priority: int = 0) -> asyncio.Future[T]:
+        """Submit a task to be executed by the worker processes, returning an awaitable for its result.
+
+        Tasks with a higher priority are handed to the workers before those waiting with a lower one.
+        """
+        return cast("asyncio.Future[T]", self._enqueue([action], chunksize=1, priority=priority)[0])
+
+    async def submit_many[T](
+        self,
+        actions: Iterable[Callable[[], T]],
+        chunksize: int | None = None,
+        *,
+        priority: int = 0,
+    ) -> list[asyncio.Future[T]]:
+        """Submit many tasks, sending `chunksize` actions per queue message.
+
+        When no chunksize is given, the actions are split into about four chunks per worker.
+        The returned futures are in the same order as the actions.
+        """
+        return cast("list[asyncio.Future[T]]", self._enqueue(actions, chunksize, priority))
+
+    async def results(self) -> AsyncGenerator[object]:
+        """Yield return values as tasks finish, until no submitted task is left unfinished.
+
+        Only tasks finishing while iterating are streamed, failed tasks are reported through `pop_errors`.
+        """
+        stream: asyncio.Queue[object] = asyncio.Queue()
+        self._streams.add(stream)
+        try:
+            while self._futures or not stream.empty():
+                value = await stream.get()
+                if value is not _IDLE:
+                    yield value
+        finally:
+            self._streams.discard(stream)
+
+    async def pop_errors(self) -> AsyncGenerator[BaseException]:
+        """Retrieve all errors that occurred during task execution."""
+        while not self._async_errors.empty():
+            yield self._async_errors.get_nowait()
+
+    async def wait(self) -> None:
+        """Wait for all submitted tasks to finish."""
+        if pending := self._pending():
+            await asyncio.wait(cast("list[asyncio.Future[object]]", pending))
@@ -0,0 +1,151 @@
+"""Scheduling of submitted chunks onto the queues of a worker pool."""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from queue import Empty
+from typing import TYPE_CHECKING, Literal
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from multiprocessing.queues import Queue
+
+type Scheduler = Literal["shared", "stealing"]
+"""How chunks reach the workers.
+
+- `shared`: every worker takes chunks from one queue.
+- `stealing`: every worker has its own queue, and takes chunks from the others when it runs dry.
+"""
+
+STEAL_INTERVAL = 0.05
+"""Seconds an idle worker blocks on its own queue before trying to steal again."""
+
+
+def next_batch[B](index: int, queues: Sequence[Queue[B | None]]) -> tuple[int, B | None]:
+    """Take the next batch for worker `index`, returning it with the index of the queue it came from.
+
+    With a single queue this simply blocks on it. Otherwise the worker's own queue is tried first,
+    then the other queues are stolen from, before blocking on its own queue for a short while.
+    """
+    own = queues[index]
+    if len(queues) == 1:
+        return index, own.get()
+    victims = [*range(index + 1, len(queues)), *range(index)]
+    while True:
+        try:
+            return index, own.get_nowait()
+        except Empty:
+            pass
+        for victim in victims:
+            try:
+                batch = queues[victim].get_nowait()
+            except Empty:
+                continue
+            if batch is None:  # Exit signals are meant for the queue's owner only.
+                queues[victim].put(None)
+                continue
+            return victim, batch
+        try:
+            return index, own.get(timeout=STEAL_INTERVAL)
+        except Empty:
+            pass
+
+
+class Dispatcher[B]:
+    """Holds submitted batches in priority order, and feeds them to the worker queues as they have room.
+
+    Every queue holds at most `capacity` batches that haven't been reported done,
+    so urgent batches submitted later can still overtake those waiting here.
+    """
+
+    def __init__(self, queues: Sequence[Queue[B | None]], capacity: int) -> None:
+        """Initialize the dispatcher for the given queues."""
+        self.queues = queues
+        self.capacity = capacity
+        self._heap: list[tuple[int, int, B]] = []
+        self._order = itertools.count()
+        self._outstanding = [0] * len(queues)
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread: threading.Thread | None = None
+
+    @property
+    def backlog(self) -> int:
+        """Return the number of batches that are waiting to be sent to a worker."""
+        return len(self._heap)
+
+    @property
+    def outstanding(self) -> int:
+        """Return the number of batches sent to workers and not reported done yet."""
+        return sum(self._outstanding)
+
+    def start(self) -> None:
+        """Start sending batches to the queues from a background thread."""
+        if self._thread is not None:
+            return
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="WorkerPool-dispatcher", daemon=True)
+        self._thread.start()
+
+    def push(self, batch: B, priority: int = 0) -> None:
+        """Queue a batch, batches with a higher priority are sent first."""
+        with self._condition:
+            heapq.heappush(self._heap, (-priority, next(self._order), batch))
+            self._condition.notify()
+
+    def done(self, queue_index: int) -> None:
+        """Report a batch from the given queue as finished, making room for the next one."""
+        with self._condition:
+            self._outstanding[queue_index] = max(0, self._outstanding[queue_index] - 1)
+            self._condition.notify()
+
+    def resize(self, capacity: int) -> None:
+        """Change how many unfinished batches every queue may hold."""
+        with self._condition:
+            self.capacity = capacity
+            self._condition.notify()
+
+    def stop(self, *, discard: bool = False) -> list[B]:
+        """Stop the background thread once every batch has been sent, returning the discarded batches.
+
+        With `discard`, batches that haven't been sent yet are dropped instead of waited on.
+        """
+        with self._condition:
+            dropped = [batch for _, _, batch in self._heap] if discard or self._thread is None else []
+            if dropped:
+                self._heap.clear()
+            self._closed = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return dropped
+
+    def _free_queue(self) -> int | None:
+        """Return the index of the least busy queue that has room, if any."""
+        index = min(range(len(self._outstanding)), key=self._outstanding.__getitem__)
+        return index if self._outstanding[index] < self.capacity else None
+
+    def _run(self) -> None:
+        while (item := self._next()) is not None:
+            index, batch = item
+            self.queues[index].put(batch)
+
+    def _ready(self) -> bool:
+        """Return whether a batch can be sent, or the dispatcher has nothing left to do."""
+        if self._heap:
+            return self._free_queue() is not None
+        return self._closed
+
+    def _next(self) -> tuple[int, B] | None:
+        """Wait until a batch can be sent, returning the queue for it, or None once stopped."""
+        with self._condition:
+            self._condition.wait_for(self._ready)
+            index = self._free_queue()
+            if not self._heap or index is None:
+                return None
+            _, _, batch = heapq.heappop(self._heap)
+            self._outstanding[index] += 1
+            return index, batch
@@ -0,0 +1,91 @@
+"""Pass large buffers to workers through shared memory instead of pickling them."""
+
+from __future__ import annotations
+
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Buffer, Generator
+
+
+def _attach(name: str) -> SharedMemory:
+    """Attach to an existing block without letting this process's resource tracker unlink it."""
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    return SharedMemory(name=name)
+
+
+@dataclass(frozen=True, slots=True)
+class SharedBuffer:
+    """A lightweight, picklable handle to a buffer in shared memory.
+
+    Handles are created by `share` or `allocate` on a worker pool, which owns the memory
+    and unlinks it on `close`. Pass the handle to an action instead of the data itself.
+    """
+
+    name: str
+    size: int
+
+    @contextmanager
+    def open(self) -> Generator[memoryview]:
+        """Attach to the shared memory and yield a writable view of the buffer.
+
+        The view, and anything created from it (like a NumPy array), must not be used after the block exits.
+        """
+        shm = _attach(self.name)
+        view = shm.buf[: self.size]
+        try:
+            yield view
+        finally:
+            view.release()
+            shm.close()
+
+    def read(self) -> bytes:
+        """Return a copy of the buffer's contents."""
+        with self.open() as view:
+            return bytes(view)
+
+
+class SharedMemoryRegistry:
+    """Tracks the shared memory blocks owned by a pool, so they can be unlinked together."""
+
+    def __init__(self) -> None:
+        """Initialize an empty registry."""
+        self._blocks: dict[str, SharedMemory] = {}
+
+    def __len__(self) -> int:
+        """Return the number of blocks that are still registered."""
+        return len(self._blocks)
+
+    def allocate(self, size: int) -> SharedBuffer:
+        """Create a zero-filled block of `size` bytes."""
+        if size < 0:
+            msg = f"size must not be negative, got {size}"
+            raise ValueError(msg)
+        shm = SharedMemory(create=True, size=max(size, 1))  # Zero sized blocks are not allowed.
+        self._blocks[shm.name] = shm
+        return SharedBuffer(shm.name, size)
+
+    def share(self, data: Buffer) -> SharedBuffer:
+        """Copy `data` into a new block."""
+        source = memoryview(data).cast("B")
+        buffer = self.allocate(source.nbytes)
+        self._blocks[buffer.name].buf[: buffer.size] = source
+        return buffer
+
+    def release(self, buffer: SharedBuffer) -> None:
+        """Close and unlink a single block before the pool closes."""
+        if shm := self._blocks.pop(buffer.name, None):
+            shm.close()
+            shm.unlink()
+
+    def clear(self) -> None:
+        """Close and unlink every block."""
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+        self._blocks.clear()
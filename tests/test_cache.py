@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import logging
+import time
+
+import pytest
+
+from herogold.cache import Cache, LFUPolicy, LRUPolicy, TinyLFUPolicy, estimate_size
+
+
+class Value:
+    def __init__(self, data: bytes = b"") -> None:
+        self.data = data
+
+
+def _owner(cache: Cache[object, Value]) -> type:
+    return type("Owner", (), {"value": cache})
+
+
+def test_cache_returns_set_values() -> None:
+    owner = _owner(Cache())()
+    value = Value()
+    owner.value = value
+    assert owner.value is value
+
+
+def test_cache_reports_missing_keys() -> None:
+    owner = _owner(Cache())()
+    assert isinstance(owner.value, AttributeError)
+
+
+def test_cache_drops_collected_values() -> None:
+    cache: Cache[object, Value] = Cache()
+    owner = _owner(cache)()
+    owner.value = Value()
+    assert isinstance(owner.value, AttributeError)
+    assert len(cache) == 0
+
+
+def test_bounded_cache_evicts_least_recently_used() -> None:
+    cache: Cache[object, Value] = Cache(maxsize=2)
+    owner_type = _owner(cache)
+    owners = [owner_type() for _ in range(3)]
+    values = [Value() for _ in range(3)]
+    owners[0].value, owners[1].value = values[0], values[1]
+    _ = owners[0].value
+    owners[2].value = values[2]
+
+    assert owners[0].value is values[0]
+    assert isinstance(owners[1].value, AttributeError)
+    assert owners[2].value is values[2]
+    assert len(cache) == 2
+
+
+def test_bounded_cache_weighs_values() -> None:
+    small, large = Value(b"x"), Value(bytes(1000))
+    cache: Cache[object, Value] = Cache(maxsize=estimate_size(large) + estimate_size(small), weigher=estimate_size)
+    owner_type = _owner(cache)
+    first, second, third = owner_type(), owner_type(), owner_type()
+    first.value, second.value = large, small
+    third.value = Value(bytes(1000))
+
+    assert isinstance(first.value, AttributeError)
+    assert second.value is small
+
+
+def test_lru_policy_evicts_oldest() -> None:
+    policy: LRUPolicy[str] = LRUPolicy(2)
+    assert policy.add("a") == []
+    assert policy.add("b") == []
+    policy.access("a")
+    assert policy.add("c") == ["b"]
+    assert len(policy) == 2
+
+
+def test_policies_reject_entries_heavier_than_maxsize() -> None:
+    for policy in (LRUPolicy[str](4), LFUPolicy[str](4), TinyLFUPolicy[str](4)):
+        assert policy.add("heavy", 5) == ["heavy"]
+        assert "heavy" not in policy
+        assert policy.weight == 0
+
+
+def test_lfu_policy_evicts_least_used() -> None:
+    policy: LFUPolicy[str] = LFUPolicy(2)
+    policy.add("a")
+    policy.add("b")
+    policy.access("b")
+    policy.access("a")
+    policy.access("a")
+    assert policy.add("c") == ["b"]
+    assert "a" in policy
+    assert "c" in policy
+
+
+def test_weighted_policy_evicts_until_it_fits() -> None:
+    policy: LRUPolicy[str] = LRUPolicy(10)
+    policy.add("a", 4)
+    policy.add("b", 4)
+    assert policy.add("c", 8) == ["a", "b"]
+    assert policy.weight == 8
+
+
+@pytest.mark.parametrize("policy_type", [LRUPolicy, LFUPolicy, TinyLFUPolicy])
+def test_policies_never_exceed_maxsize(policy_type: type[LRUPolicy[int]]) -> None:
+    policy = policy_type(50)
+    tracked: set[int] = set()
+    for key in range(1000):
+        tracked.add(key % 120)
+        tracked.difference_update(policy.add(key % 120, 1 + key % 3))
+        policy.access(key % 7)
+        assert policy.weight <= policy.maxsize
+    assert tracked == {key for key in range(120) if key in policy}
+
+
+def test_tinylfu_policy_keeps_frequent_keys_during_a_scan() -> None:
+    policy: TinyLFUPolicy[str] = TinyLFUPolicy(100)
+    hot = [f"hot-{i}" for i in range(50)]
+    for key in hot:
+        policy.add(key)
+    policy.add("warm-up")  # Moves the last hot key out of the window.
+    for _ in range(5):
+        for key in hot:
+            policy.access(key)
+    for i in range(1000):
+        policy.add(f"scan-{i}")
+
+    assert all(key in policy for key in hot)
+    assert len(policy) <= 100
+
+
+def test_lru_policy_loses_frequent_keys_during_a_scan() -> None:
+    policy: LRUPolicy[str] = LRUPolicy(100)
+    for i in range(50):
+        policy.add(f"hot-{i}")
+    for i in range(1000):
+        policy.add(f"scan-{i}")
+
+    assert not any(f"hot-{i}" in policy for i in range(50))
+
+
+def test_cache_purges_collected_values_without_reading_them() -> None:
+    cache: Cache[object, Value] = Cache()
+    owner_type = _owner(cache)
+    owners = [owner_type() for _ in range(10)]
+    for owner in owners:
+        owner.value = Value()
+    assert len(cache) == 0
+
+
+def test_cache_purge_keeps_replaced_values() -> None:
+    cache: Cache[object, Value] = Cache()
+    owner = _owner(cache)()
+    owner.value = Value()
+    kept = Value()
+    owner.value = kept
+    cache.purge()
+    assert owner.value is kept
+
+
+def test_hot_set_keeps_recently_read_values_alive() -> None:
+    cache: Cache[object, Value] = Cache(hot=1)
+    owner_type = _owner(cache)
+    first, second = owner_type(), owner_type()
+    first.value = value = Value()
+    _ = first.value
+    del value
+    assert isinstance(first.value, Value)
+
+    second.value = other = Value()
+    _ = second.value
+    del other
+    assert isinstance(first.value, AttributeError)
+    assert isinstance(second.value, Value)
+
+
+def test_cache_counts_hits_misses_evictions_and_collections() -> None:
+    cache: Cache[object, Value] = Cache(maxsize=3)
+    owner_type = _owner(cache)
+    owners = [owner_type() for _ in range(4)]
+    values = [Value(bytes(100)) for _ in range(3)]
+    for owner, value in zip(owners, values, strict=False):
+        owner.value = value
+    owners[3].value = Value()
+    _ = owners[1].value, owners[2].value, owners[0].value, owners[3].value
+
+    assert (cache.stats.hits, cache.stats.misses) == (2, 2)
+    assert cache.stats.evictions == 1
+    assert cache.stats.collected == 1
+    snapshot = cache.snapshot()
+    assert snapshot["size"] == 2
+    assert snapshot["memory"] == 2 * estimate_size(values[0])
+    assert snapshot["hit_rate"] == 0.5
+
+
+def test_cache_logs_stats_periodically(caplog: pytest.LogCaptureFixture) -> None:
+    cache: Cache[object, Value] = Cache()
+    owner = _owner(cache)()
+    owner.value = value = Value()
+    _ = owner.value
+    with caplog.at_level(logging.INFO, logger="herogold.cache.stats"):
+        logger = cache.log_stats(0.01, name="values")
+        time.sleep(0.1)
+        logger.stop()
+    assert value is not None
+    assert caplog.records
+    assert caplog.records[0].getMessage().startswith("values: hits=1 misses=0")
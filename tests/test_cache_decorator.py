@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import inspect
+
+import pytest
+
+from herogold.cache import cached
+
+
+def test_cached_memoizes_sync_functions() -> None:
+    calls: list[int] = []
+
+    @cached()
+    def double(value: int) -> int:
+        calls.append(value)
+        return value * 2
+
+    assert [double(1), double(1), double(2), double(value=2)] == [2, 2, 4, 4]
+    assert calls == [1, 2, 2]
+    info = double.cache_info()
+    assert (info["hits"], info["misses"], info["size"]) == (1, 3, 3)
+
+
+def test_cached_memoizes_async_functions() -> None:
+    calls: list[int] = []
+
+    @cached(maxsize=1)
+    async def double(value: int) -> int:
+        calls.append(value)
+        await asyncio.sleep(0)
+        return value * 2
+
+    async def run() -> list[int]:
+        return [await double(1), await double(1), await double(2), await double(1)]
+
+    assert inspect.iscoroutinefunction(double)
+    assert asyncio.run(run()) == [2, 2, 4, 2]
+    assert calls == [1, 2, 1]
+    assert double.cache_info()["evictions"] == 2
+
+
+def test_cached_uses_custom_key() -> None:
+    @cached(key=lambda name, **_: name.lower())
+    def greet(name: str, *, punctuation: str = "!") -> str:
+        return f"Hello {name}{punctuation}"
+
+    assert greet("World") == "Hello World!"
+    assert greet("WORLD", punctuation="?") == "Hello World!"
+
+
+def test_cached_does_not_cache_exceptions() -> None:
+    calls: list[int] = []
+
+    @cached()
+    def fail(value: int) -> int:
+        calls.append(value)
+        raise ValueError(value)
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="1"):
+            fail(1)
+    assert calls == [1, 1]
+
+
+def test_cached_expires_results() -> None:
+    @cached(ttl=10)
+    def value() -> object:
+        return object()
+
+    now = [0.0]
+    value.cache.clock = lambda: now[0]
+    first = value()
+    assert value() is first
+    now[0] = 11
+    assert value() is not first
+    assert value.cache_info()["expirations"] == 1
+
+
+def test_cached_binds_to_instances() -> None:
+    class Counter:
+        def __init__(self, start: int) -> None:
+            self.start = start
+
+        @cached()
+        def add(self, value: int) -> int:
+            return self.start + value
+
+    one, ten = Counter(1), Counter(10)
+    assert (one.add(1), ten.add(1), one.add(1)) == (2, 11, 2)
+    assert Counter.add.cache_info()["hits"] == 1
+    Counter.add.cache_clear()
+    assert Counter.add.cache_info()["size"] == 0
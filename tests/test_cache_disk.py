@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import pickle
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+
+import pytest
+
+from herogold.cache import DiskCache, cached
+from herogold.sentinel import MISSING
+from herogold.workers import WorkerPool
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+timeout = 5  # seconds
+
+
+@dataclass(frozen=True)
+class Point:
+    x: int
+    y: int
+
+
+@pytest.fixture
+def disk(tmp_path: Path) -> Iterator[DiskCache]:
+    with DiskCache(tmp_path / "cache.log") as cache:
+        yield cache
+
+
+def _store_square(cache: DiskCache, value: int) -> bool:
+    return cache.set(("square", value), value * value)
+
+
+def test_disk_cache_round_trips_values(disk: DiskCache) -> None:
+    disk.set("text", "value")
+    disk.set(("tuple", 1), {"nested": [1, 2.5, None]})
+    disk.set(Point(1, 2), Point(3, 4))
+    disk.set("large", bytes(1 << 20))
+
+    assert disk.get("text") == "value"
+    assert disk.get(("tuple", 1)) == {"nested": [1, 2.5, None]}
+    assert disk.get(Point(1, 2)) == Point(3, 4)
+    assert disk.get("large") == bytes(1 << 20)
+    assert disk.get("missing") is MISSING
+    assert (disk.stats.hits, disk.stats.misses) == (4, 1)
+
+
+def test_disk_cache_survives_reopening(disk: DiskCache) -> None:
+    disk.set("kept", 1)
+    disk.set("overwritten", 1)
+    disk.set("overwritten", 2)
+    disk.set("deleted", 3)
+    assert disk.delete("deleted")
+    assert not disk.delete("deleted")
+    disk.close()
+
+    with DiskCache(disk.path) as reopened:
+        assert reopened.get("kept") == 1
+        assert reopened.get("overwritten") == 2
+        assert reopened.get("deleted") is MISSING
+        assert len(reopened) == 2
+        assert reopened.garbage_ratio > 0
+
+
+def test_disk_cache_expires_entries(disk: DiskCache) -> None:
+    disk.set("short", 1, ttl=0.01)
+    disk.set("long", 2, ttl=60)
+    time.sleep(0.02)
+    assert disk.get("short") is MISSING
+    assert disk.get("long") == 2
+
+
+def test_disk_cache_compact_drops_dead_records(disk: DiskCache) -> None:
+    for value in range(100):
+        disk.set("counter", value)
+    disk.set("expired", 1, ttl=0.01)
+    disk.set("kept", "value")
+    time.sleep(0.02)
+    size = disk.path.stat().st_size
+
+    disk.compact()
+
+    assert disk.path.stat().st_size < size / 10
+    assert disk.garbage_ratio == 0
+    assert disk.get("counter") == 99
+    assert disk.get("kept") == "value"
+    assert len(disk) == 2
+
+
+def test_disk_cache_cuts_off_torn_records(disk: DiskCache) -> None:
+    disk.set("complete", 1)
+    disk.set("torn", 2)
+    disk.close()
+    with disk.path.open("r+b") as file:
+        file.truncate(disk.path.stat().st_size - 1)
+
+    with DiskCache(disk.path) as reopened:
+        assert reopened.get("complete") == 1
+        assert reopened.get("torn") is MISSING
+        reopened.set("after", 3)
+    with DiskCache(disk.path) as reopened:
+        assert reopened.get("after") == 3
+
+
+def test_disk_cache_sees_writes_of_other_handles(disk: DiskCache) -> None:
+    with DiskCache(disk.path) as other:
+        other.set("key", "value")
+        assert disk.get("key") == "value"
+        disk.set("key", "updated")
+        assert other.get("key") == "value"  # Hits are served from the handle's own index until it misses.
+        assert other.delete("key")
+        assert disk.get("missing") is MISSING
+        assert disk.get("key") is MISSING
+
+
+def test_disk_cache_is_shared_with_worker_processes(disk: DiskCache) -> None:
+    with WorkerPool(size=2) as pool:
+        stored = pool.submit_many([partial(_store_square, disk, i) for i in range(20)], chunksize=3)
+        pool.wait()
+        assert all(future.result(timeout) for future in stored)
+    assert [disk.get(("square", i)) for i in range(20)] == [i * i for i in range(20)]
+    with pickle.loads(pickle.dumps(disk)) as unpickled:  # noqa: S301
+        assert unpickled.get(("square", 3)) == 9
+
+
+def test_disk_cache_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "other"
+    path.write_bytes(b"not a cache" * 10)
+    with pytest.raises(ValueError, match="not a disk cache"):
+        DiskCache(path)
+
+
+def test_cached_consults_disk_tier_after_restart(disk: DiskCache) -> None:
+    calls: list[int] = []
+
+    def square(value: int) -> int:
+        calls.append(value)
+        return value * value
+
+    assert cached(tiers=(disk,))(square)(3) == 9
+    disk.close()
+    with DiskCache(disk.path) as restarted:
+        assert cached(tiers=(restarted,))(square)(3) == 9
+    assert calls == [3]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import pickle
+import time
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING
+
+import pytest
+
+from herogold.cache import SharedCache, cached
+from herogold.sentinel import MISSING
+from herogold.workers import WorkerPool
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+timeout = 5  # seconds
+
+
+@dataclass(frozen=True)
+class Point:
+    x: int
+    y: int
+
+
+@pytest.fixture
+def shared(tmp_path: Path) -> Iterator[SharedCache]:
+    with SharedCache(tmp_path / "cache", slots=64, slot_size=256, ways=8) as cache:
+        yield cache
+
+
+def _store_square(cache: SharedCache, value: int) -> bool:
+    return cache.set(("square", value), value * value)
+
+
+def _read(cache: SharedCache, key: object) -> object:
+    return cache.get(key, None)
+
+
+def test_shared_cache_round_trips_values(shared: SharedCache) -> None:
+    shared.set("text", "value")
+    shared.set(("tuple", 1), {"nested": [1, 2.5, None]})
+    shared.set(Point(1, 2), Point(3, 4))
+
+    assert shared.get("text") == "value"
+    assert shared.get(("tuple", 1)) == {"nested": [1, 2.5, None]}
+    assert shared.get(Point(1, 2)) == Point(3, 4)
+    assert shared.get("missing") is MISSING
+    assert (shared.stats.hits, shared.stats.misses) == (3, 1)
+
+
+def test_shared_cache_expires_entries(shared: SharedCache) -> None:
+    shared.set("short", 1, ttl=0.01)
+    shared.set("long", 2, ttl=60)
+    time.sleep(0.02)
+    assert shared.get("short") is MISSING
+    assert shared.get("long") == 2
+
+
+def test_shared_cache_overwrites_oldest_slot_of_full_bucket(tmp_path: Path) -> None:
+    with SharedCache(tmp_path / "cache", slots=4, slot_size=128, ways=4) as cache:
+        for value in range(5):
+            assert cache.set(value, value)
+        assert cache.get(0) is MISSING
+        assert [cache.get(value) for value in range(1, 5)] == [1, 2, 3, 4]
+        assert cache.stats.evictions == 1
+        assert len(cache) == 4
+
+
+def test_shared_cache_skips_values_larger_than_a_slot(shared: SharedCache) -> None:
+    assert not shared.set("large", bytes(1000))
+    assert shared.get("large") is MISSING
+
+
+def test_shared_cache_delete_and_clear(shared: SharedCache) -> None:
+    shared.set("a", 1)
+    shared.set("b", 2)
+    assert shared.delete("a")
+    assert not shared.delete("a")
+    shared.clear()
+    assert len(shared) == 0
+
+
+def test_shared_cache_is_shared_with_reopened_and_unpickled_handles(shared: SharedCache) -> None:
+    shared.set("key", "value")
+    with SharedCache(shared.path) as reopened:
+        assert reopened.get("key") == "value"
+        assert (reopened.slots, reopened.slot_size) == (64, 256)
+    with pickle.loads(pickle.dumps(shared)) as unpickled:  # noqa: S301
+        assert unpickled.get("key") == "value"
+
+
+def test_shared_cache_is_shared_with_worker_processes(shared: SharedCache) -> None:
+    with WorkerPool(size=2) as pool:
+        stored = pool.submit_many([partial(_store_square, shared, i) for i in range(20)], chunksize=3)
+        pool.wait()
+        assert all(future.result(timeout) for future in stored)
+        shared.set("from parent", "hello")
+        assert pool.submit(partial(_read, shared, "from parent")).result(timeout) == "hello"
+    assert [shared.get(("square", i)) for i in range(20)] == [i * i for i in range(20)]
+
+
+def test_shared_cache_rejects_other_files(tmp_path: Path) -> None:
+    path = tmp_path / "other"
+    path.write_bytes(b"not a cache" * 10)
+    with pytest.raises(ValueError, match="not a shared cache"):
+        SharedCache(path)
+
+
+def test_cached_consults_shared_tier(shared: SharedCache) -> None:
+    calls: list[int] = []
+
+    def square(value: int) -> int:
+        calls.append(value)
+        return value * value
+
+    first = cached(tiers=(shared,))(square)
+    second = cached(tiers=(shared,))(square)  # Stands in for the same function in another process.
+    assert first(3) == 9
+    assert second(3) == 9
+    assert calls == [3]
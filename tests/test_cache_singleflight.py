@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from herogold.cache import AsyncSingleFlight, SingleFlight, cached
+
+timeout = 1  # seconds
+
+
+def test_single_flight_shares_one_load() -> None:
+    flight: SingleFlight[str, int] = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls: list[int] = []
+
+    def load() -> int:
+        calls.append(1)
+        started.set()
+        release.wait(timeout)
+        return 42
+
+    with ThreadPoolExecutor(4) as executor:
+        leader = executor.submit(flight.do, "key", load)
+        started.wait(timeout)
+        followers = [executor.submit(flight.do, "key", load) for _ in range(3)]
+        time.sleep(0.05)
+        assert "key" in flight
+        release.set()
+        assert [f.result(timeout) for f in [leader, *followers]] == [42] * 4
+    assert calls == [1]
+    assert "key" not in flight
+
+
+def test_single_flight_shares_exceptions() -> None:
+    flight: SingleFlight[str, int] = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def load() -> int:
+        started.set()
+        release.wait(timeout)
+        raise ValueError
+
+    with ThreadPoolExecutor(2) as executor:
+        leader = executor.submit(flight.do, "key", load)
+        started.wait(timeout)
+        follower = executor.submit(flight.do, "key", load)
+        time.sleep(0.05)
+        release.set()
+        assert isinstance(leader.exception(timeout), ValueError)
+        assert follower.exception(timeout) is leader.exception()
+
+
+def test_async_single_flight_shares_one_load() -> None:
+    flight: AsyncSingleFlight[str, int] = AsyncSingleFlight()
+    calls: list[int] = []
+
+    async def load() -> int:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 42
+
+    async def run() -> list[int]:
+        return await asyncio.gather(*(flight.do("key", load) for _ in range(10)))
+
+    assert asyncio.run(run()) == [42] * 10
+    assert calls == [1]
+
+
+def test_cached_coalesces_concurrent_misses() -> None:
+    calls: list[int] = []
+
+    @cached()
+    def slow(value: int) -> int:
+        calls.append(value)
+        time.sleep(0.1)
+        return value
+
+    with ThreadPoolExecutor(8) as executor:
+        assert list(executor.map(slow, [1] * 8)) == [1] * 8
+    assert calls == [1]
+
+
+def test_cached_serves_stale_results_while_refreshing() -> None:
+    versions = iter(range(10))
+
+    @cached(ttl=10, stale=100)
+    def version() -> int:
+        return next(versions)
+
+    now = [0.0]
+    version.cache.clock = lambda: now[0]
+    assert version() == 0
+    now[0] = 50
+    assert version() == 0
+    deadline = time.monotonic() + timeout
+    while version.cache.get(()) != 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert version() == 1
+    now[0] = 500
+    assert version() == 2
+    assert version.cache_info()["stale_hits"] == 1
+
+
+def test_async_cached_serves_stale_results_while_refreshing() -> None:
+    versions = iter(range(10))
+    now = [0.0]
+
+    @cached(ttl=10, stale=100)
+    async def version() -> int:
+        await asyncio.sleep(0)
+        return next(versions)
+
+    version.cache.clock = lambda: now[0]
+
+    async def run() -> None:
+        assert await version() == 0
+        now[0] = 50
+        assert await version() == 0
+        await asyncio.sleep(0.01)
+        assert await version() == 1
+
+    asyncio.run(run())
+
+
+def test_async_cached_coalesces_concurrent_misses() -> None:
+    calls: list[int] = []
+
+    @cached()
+    async def slow(value: int) -> int:
+        calls.append(value)
+        await asyncio.sleep(0.01)
+        return value
+
+    async def run() -> list[int]:
+        return await asyncio.gather(*(slow(1) for _ in range(10)))
+
+    assert asyncio.run(run()) == [1] * 10
+    assert calls == [1]
+
+
+def test_cached_failing_load_is_raised_to_every_waiter() -> None:
+    @cached()
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise ValueError
+
+    async def run() -> list[BaseException | int]:
+        return await asyncio.gather(*(fail() for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    with pytest.raises(ValueError):  # noqa: PT011
+        asyncio.run(fail())
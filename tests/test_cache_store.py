@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from herogold.cache import Store
+from herogold.sentinel import MISSING
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _store(**options: float) -> tuple[Store[str, int], Clock]:
+    store: Store[str, int] = Store(**options)
+    clock = store.clock = Clock()
+    return store, clock
+
+
+def test_store_counts_hits_and_misses() -> None:
+    store, _ = _store()
+    store.set("a", 1)
+    assert store.get("a") == 1
+    assert store.get("b") is MISSING
+    assert store.get("b", 0) == 0
+    assert (store.stats.hits, store.stats.misses) == (1, 2)
+
+
+def test_store_expires_entries_lazily() -> None:
+    store, clock = _store(ttl=10, sweep_interval=1000)
+    store.set("a", 1)
+    store.set("b", 2, ttl=100)
+    clock.now = 50
+    assert "a" not in store
+    assert len(store) == 2
+    assert store.get("a") is MISSING
+    assert store.get("b") == 2
+    assert store.stats.expirations == 1
+
+
+def test_store_sweeps_expired_entries_periodically() -> None:
+    store, clock = _store(ttl=10)
+    for key in "abc":
+        store.set(key, 1)
+    clock.now = 5
+    store.set("d", 1)
+    clock.now = 12
+    store.get("d")
+
+    assert len(store) == 1
+    assert store.stats.expirations == 3
+
+
+def test_bounded_store_counts_evictions() -> None:
+    store, _ = _store(maxsize=2)
+    for value, key in enumerate("abc"):
+        store.set(key, value)
+    assert len(store) == 2
+    assert store.get("a") is MISSING
+    assert store.stats.evictions == 1
+
+
+def test_store_delete_and_clear() -> None:
+    store, _ = _store(maxsize=2)
+    store.set("a", 1)
+    assert store.delete("a")
+    assert not store.delete("a")
+    store.set("b", 2)
+    store.clear()
+    assert len(store) == 0
+    store.set("c", 3)
+    store.set("d", 4)
+    assert store.stats.evictions == 0
@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import asyncio
 
+import pytest
+
 import herogold.loops as loops
+from herogold.workers import MetricsRecorder
 
 
 def _square(value: int) -> int:
@@ -15,3 +18,73 @@ def test_a_parallel_runs_sync_action_in_async_context() -> None:
         assert results == [0, 1, 4, 9, 16]
 
     asyncio.run(run())
+
+
+def test_parallel_reuses_shared_pool() -> None:
+    assert list(loops.parallel(_square, range(5))) == [0, 1, 4, 9, 16]
+    pool = loops.get_pool()
+    assert list(loops.parallel(_square, range(3), chunksize=1)) == [0, 1, 4]
+    assert loops.get_pool() is pool
+
+
+def test_shutdown_replaces_shared_pool() -> None:
+    pool = loops.get_pool()
+    loops.shutdown()
+    assert loops.get_pool() is not pool
+
+
+def test_adaptive_chunksize_uses_measured_latency() -> None:
+    def action(value: int) -> int:
+        return value
+
+    count = loops.cpu_count * 4 * 100
+    assert loops.adaptive_chunksize(action, count) == 100
+
+    loops._record_latency(action, loops.target_chunk_seconds / 10)
+    assert loops.adaptive_chunksize(action, count) == 10
+
+    loops._record_latency(action, loops.target_chunk_seconds * 10)
+    assert loops.adaptive_chunksize(action, count) == 1
+
+
+def test_a_parallel_unordered_yields_every_result() -> None:
+    async def run() -> None:
+        results = [i async for i in loops.a_parallel(_square, loops.a_range(20), max_in_flight=3, ordered=False)]
+        assert sorted(results) == [i * i for i in range(20)]
+
+    asyncio.run(run())
+
+
+def test_a_parallel_window_of_one_keeps_order() -> None:
+    async def run() -> None:
+        results = [i async for i in loops.a_parallel(_square, loops.a_range(6), max_in_flight=1)]
+        assert results == [0, 1, 4, 9, 16, 25]
+
+    asyncio.run(run())
+
+
+def test_a_parallel_rejects_empty_window() -> None:
+    async def run() -> None:
+        with pytest.raises(ValueError, match="max_in_flight"):
+            _ = [i async for i in loops.a_parallel(_square, loops.a_range(1), max_in_flight=0)]
+
+    asyncio.run(run())
+
+
+def test_parallel_reports_task_metrics() -> None:
+    recorder = MetricsRecorder()
+    assert list(loops.parallel(_square, range(5), on_task=recorder)) == [0, 1, 4, 9, 16]
+
+    assert [m.task_id for m in recorder.records] == list(range(5))
+    assert all(m.payload_bytes and m.result_bytes for m in recorder.records)
+
+
+def test_a_parallel_reports_task_metrics() -> None:
+    recorder = MetricsRecorder()
+
+    async def run() -> None:
+        _ = [i async for i in loops.a_parallel(_square, loops.a_range(6), ordered=False, on_task=recorder)]
+
+    asyncio.run(run())
+    assert sorted(m.task_id for m in recorder.records) == list(range(6))
+    assert all(m.enqueued <= m.started <= m.finished for m in recorder.records)
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+from functools import partial
+from typing import TYPE_CHECKING
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from herogold.orm.api_model import AsyncAPIModel
+from herogold.orm.async_model import AsyncBaseModel
+from herogold.orm.errors import AlreadyExistsError, NotFoundError
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+pytest.importorskip("aiosqlite")
+
+
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer_on_sqlite(type_, compiler, **kw):
+    return "INTEGER"
+
+
+class Gadget(AsyncBaseModel, table=True):
+    name: str
+    price: int = 0
+
+
+@pytest.fixture
+def database(tmp_path: Path) -> Iterator[None]:
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+
+    async def create() -> None:
+        async with engine.begin() as connection:
+            await connection.run_sync(SQLModel.metadata.create_all)
+
+    asyncio.run(create())
+    original = AsyncBaseModel.async_session
+    AsyncBaseModel.async_session = partial(AsyncSession, engine, expire_on_commit=False)
+    try:
+        yield
+    finally:
+        AsyncBaseModel.async_session = original
+        asyncio.run(engine.dispose())
+
+
+@pytest.mark.usefixtures("database")
+def test_add_get_update_delete() -> None:
+    async def main() -> None:
+        gadget = Gadget(name="lamp", price=10)
+        await gadget.add()
+        assert gadget.id is not None
+        with pytest.raises(AlreadyExistsError):
+            await gadget.add()
+
+        assert (await Gadget.get(gadget.id)).name == "lamp"
+        await Gadget(id=gadget.id, name="desk lamp", price=12).update()
+        assert (await Gadget.get(gadget.id)).price == 12
+
+        await (await Gadget.get(gadget.id)).delete()
+        assert (await Gadget.get(gadget.id)).deleted_at is not None
+        with pytest.raises(NotFoundError):
+            await Gadget(id=gadget.id, name="desk lamp").delete()
+        with pytest.raises(NotFoundError):
+            await Gadget.get(gadget.id + 1)
+
+    asyncio.run(main())
+
+
+@pytest.mark.usefixtures("database")
+def test_get_all_and_from() -> None:
+    async def main() -> None:
+        await asyncio.gather(*(Gadget(name=name).add() for name in ("cup", "plate", "cup")))
+        assert len(await Gadget.get_all()) == 3
+        assert [gadget.name for gadget in await Gadget.from_(Gadget.name, "cup")] == ["cup", "cup"]
+
+    asyncio.run(main())
+
+
+@pytest.mark.usefixtures("database")
+def test_transaction_commits_once_or_rolls_back() -> None:
+    async def main() -> None:
+        async with Gadget.transaction():
+            await Gadget(name="fork").add()
+            await Gadget(name="knife").add()
+        assert len(await Gadget.get_all()) == 2
+
+        async def fail() -> None:
+            async with Gadget.transaction():
+                await Gadget(name="spoon").add()
+                raise RuntimeError
+
+        with pytest.raises(RuntimeError):
+            await fail()
+        assert len(await Gadget.get_all()) == 2
+
+        with pytest.raises(TypeError), Gadget.transaction():
+            pass
+
+    asyncio.run(main())
+
+
+@pytest.mark.usefixtures("database")
+def test_async_api_model() -> None:
+    router = APIRouter()
+    api = AsyncAPIModel(Gadget, router)
+    app = FastAPI()
+    app.include_router(router)
+    client = TestClient(app)
+
+    async def seed() -> None:
+        for name, price in [("bowl", 3), ("pan", 30), ("pot", 40)]:
+            await Gadget(name=name, price=price).add()
+
+    asyncio.run(seed())
+    rows = asyncio.run(api.get_all(sort="price", order="desc", limit=2))
+    assert [row.name for row in rows] == ["pot", "pan"]
+    rows = client.request("QUERY", "/", json={"filters": [{"field": "price", "op": "lt", "value": 35}]}).json()
+    assert {row["name"] for row in rows} == {"bowl", "pan"}
+    assert client.get("/1").json()["name"] == "bowl"
+    assert client.delete("/1").status_code == 200
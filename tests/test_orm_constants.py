@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from herogold.orm import constants
+
+if TYPE_CHECKING:
+    import pytest
+
+SRC = Path(__file__).parents[1] / "src"
+
+
+def test_import_creates_no_engine(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PYTHONPATH", str(SRC))
+    script = (
+        "import sys\n"
+        "from herogold.orm import constants, model\n"
+        "assert constants.get_engine.cache_info().currsize == 0\n"
+        "assert 'psycopg2' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", script], cwd=tmp_path, check=True)  # noqa: S603
+
+
+def test_lazy_attributes() -> None:
+    assert constants.engine is constants.get_engine()
+    assert constants.engine.url == constants.DATABASE_URL
+    assert constants.ASYNC_DATABASE_URL.drivername == constants.DbUrl.async_driver
+    assert constants.ASYNC_DATABASE_URL.database == constants.DATABASE_URL.database
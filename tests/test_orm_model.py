@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import BigInteger, event
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+from sqlmodel import Session, SQLModel, create_engine
+
+from herogold.orm.errors import AlreadyExistsError
+from herogold.orm.model import BaseModel
+from herogold.orm.utils import Relationship, prefetch
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sqlalchemy import Engine
+
+
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer_on_sqlite(type_, compiler, **kw):
+    return "INTEGER"
+
+
+class Author(BaseModel, table=True):
+    name: str
+
+
+class Book(BaseModel, table=True):
+    title: str
+    author_id: int | None = None
+    author = Relationship(Author)
+
+
+class Uncached(BaseModel, table=True):
+    identity_map_size = 0
+    name: str
+
+
+@pytest.fixture
+def engine() -> Iterator[Engine]:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    SQLModel.metadata.create_all(engine)
+    original = BaseModel.session
+    BaseModel.session = Session(engine)
+    try:
+        yield engine
+    finally:
+        BaseModel.session.close()
+        BaseModel.session = original
+        for model in (Author, Book):
+            if model.identity_map is not None:
+                model.identity_map.clear()
+            if model.record_count is not None:
+                model.record_count.invalidate()
+
+
+@pytest.fixture
+def selects(engine: Engine) -> list[str]:
+    statements: list[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany) -> None:
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+def test_get_serves_repeated_reads_from_identity_map(selects: list[str]) -> None:
+    author = Author(name="Ursula")
+    author.add()
+    author_id = author.id
+    assert author_id is not None
+    books = [Book(title=str(number), author_id=author_id) for number in range(5)]
+    for book in books:
+        book.add()
+    _ = [book.title for book in books]
+    selects.clear()
+
+    assert all(book.author.name == "Ursula" for book in books)
+    assert len(selects) == 1
+
+
+def test_writes_invalidate_identity_map(engine: Engine) -> None:
+    author = Author(name="Ursula")
+    author.add()
+    assert author.id is not None
+    Author.get(author.id)
+
+    Author(id=author.id, name="Le Guin").update()
+    assert Author.get(author.id).name == "Le Guin"
+    Author.get(author.id).delete()
+    assert Author.get(author.id).deleted_at is not None
+
+
+def test_identity_map_is_per_session_and_configurable(engine: Engine, selects: list[str]) -> None:
+    author = Author(name="Ursula")
+    author.add()
+    assert author.id is not None
+    Author.get(author.id)
+    with Session(engine) as other:
+        assert Author.get(author.id, other) is not Author.get(author.id)
+    assert Author.get(author.id, with_for_update=True) is not None
+
+    uncached = Uncached(name="x")
+    uncached.add()
+    assert uncached.id is not None
+    selects.clear()
+    Uncached.get(uncached.id)
+    Uncached.get(uncached.id)
+    assert Uncached.identity_map is None
+    assert len(selects) == 2
+
+
+def test_count_is_maintained_by_writes(selects: list[str]) -> None:
+    assert Author.count() == 0
+    authors = [Author(name=str(number)) for number in range(3)]
+    for author in authors:
+        author.add()
+    authors[0].delete()
+    selects.clear()
+
+    assert Author.count() == 2
+    assert Author.count() == 2
+    assert not [statement for statement in selects if "count" in statement]
+
+
+def test_count_picks_up_other_sessions_after_ttl(engine: Engine) -> None:
+    assert Author.record_count is not None
+    assert Author.count() == 0
+    with Session(engine) as other:
+        other.add(Author(name="elsewhere"))
+        other.commit()
+    assert Author.count() == 0
+    Author.record_count.invalidate()  # Stands in for the ttl running out.
+    assert Author.count() == 1
+
+
+def test_estimated_count_falls_back_to_counting(engine: Engine, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(Author, "count_estimated", True)
+    Author(name="Ursula").add()
+    assert Author.count() == 1
+
+
+def test_get_many_selects_in_chunks_and_uses_identity_map(selects: list[str]) -> None:
+    authors = [Author(name=str(number)) for number in range(7)]
+    for author in authors:
+        author.add()
+    ids = [author.id for author in authors if author.id is not None]
+    Author.get(ids[0])
+    selects.clear()
+
+    found = Author.get_many([*ids, ids[1], 999], chunk_size=3)
+
+    assert sorted(found) == ids
+    assert [found[id_].name for id_ in ids] == [str(number) for number in range(7)]
+    assert len(selects) == 3  # Seven ids in chunks of three, the first record came from the identity map.
+
+
+def test_prefetch_loads_relationships_at_once(selects: list[str]) -> None:
+    authors = [Author(name=str(number)) for number in range(3)]
+    for author in authors:
+        author.add()
+    books = [Book(title=str(number), author_id=authors[number % 3].id) for number in range(9)]
+    for book in books:
+        book.add()
+    _ = [book.author_id for book in books]
+    Author.identity_map.clear()
+    selects.clear()
+
+    assert len(prefetch(books, "author")) == 3
+    assert [book.author.name for book in books] == [str(number % 3) for number in range(9)]
+    assert len(selects) == 1
+    with pytest.raises(TypeError, match="not a relationship"):
+        prefetch(books, "title")
+
+
+def test_add_all_inserts_batches_in_one_transaction(engine: Engine) -> None:
+    commits: list[object] = []
+    event.listen(engine, "commit", commits.append)
+    authors = [Author(name=str(number)) for number in range(25)]
+
+    assert Author.add_all(iter(authors), batch_size=10, copy=True) == 25  # Falls back to inserts outside Postgres.
+
+    assert len(commits) == 1
+    assert all(author.id is not None for author in authors)
+    assert Author.count() == 25
+
+
+def test_add_all_rolls_back_on_error(engine: Engine) -> None:
+    existing = Author(name="existing")
+    existing.add()
+    with pytest.raises(AlreadyExistsError):
+        Author.add_all([Author(name="new"), existing], batch_size=1)
+    assert Author.count() == 1
+    assert [author.name for author in Author.get_all()] == ["existing"]
+
+
+def test_upsert_all_updates_conflicting_rows(engine: Engine) -> None:
+    kept, changed = Author(name="kept"), Author(name="before")
+    Author.add_all([kept, changed])
+    assert changed.id is not None
+    Author.get(changed.id)
+
+    Author.upsert_all([Author(id=changed.id, name="after"), Author(name="new")])
+    assert Author.get(changed.id).name == "after"
+    Author.upsert_all([Author(id=changed.id, name="ignored")], ignore=True)
+
+    BaseModel.session.expire_all()
+    assert sorted(author.name for author in Author.get_all()) == ["after", "kept", "new"]
+    assert Author.count() == 3
+
+
+def test_transaction_commits_writes_once(engine: Engine) -> None:
+    commits: list[object] = []
+    event.listen(engine, "commit", commits.append)
+    with Author.transaction():
+        first = Author(name="first")
+        first.add()
+        with Author.transaction():  # Joins the outer transaction.
+            Author(name="second").add()
+        assert first.id is not None
+        Author(id=first.id, name="renamed").update()
+        assert commits == []
+    assert len(commits) == 1
+    assert sorted(author.name for author in Author.get_all()) == ["renamed", "second"]
+    assert Author.count() == 2
+
+
+def test_transaction_rolls_back_on_error(engine: Engine) -> None:
+    Author(name="kept").add()
+    assert Author.count() == 1
+
+    def write() -> None:
+        with Author.transaction():
+            Author(name="dropped").add()
+            Author.add_all([Author(name="also dropped")])
+            raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        write()
+    assert [author.name for author in Author.get_all()] == ["kept"]
+    assert Author.count() == 1
+
+
+def test_transaction_works_with_async_with(engine: Engine) -> None:
+    async def write() -> None:
+        async with Author.transaction():
+            Author(name="async").add()
+
+    asyncio.run(write())
+    BaseModel.session.expire_all()
+    assert [author.name for author in Author.get_all()] == ["async"]
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+
+import pytest
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.compiler import compiles
+from sqlmodel import Session, SQLModel, create_engine
+
+from herogold.orm.model import BaseModel
+from herogold.orm.session import SessionRegistry, use_session
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+
+@compiles(BigInteger, "sqlite")
+def _bigint_as_integer_on_sqlite(type_, compiler, **kw):
+    return "INTEGER"
+
+
+class Note(BaseModel, table=True):
+    text: str
+
+
+@pytest.fixture
+def registry(tmp_path: Path) -> Iterator[SessionRegistry]:
+    # A file rather than StaticPool's single shared connection, so every thread gets its own connection.
+    engine = create_engine(f"sqlite:///{tmp_path / 'notes.db'}")
+    SQLModel.metadata.create_all(engine)
+    original = BaseModel.session
+    BaseModel.session = registry = SessionRegistry(partial(Session, engine))
+    try:
+        yield registry
+    finally:
+        registry.remove()
+        BaseModel.session = original
+
+
+def test_registry_gives_every_thread_its_own_session(registry: SessionRegistry) -> None:
+    assert registry() is registry()
+    with ThreadPoolExecutor(2) as pool:
+        sessions = list(pool.map(lambda _: registry(), range(2)))
+    assert registry() not in sessions
+    assert registry.exec is not None  # Attributes are looked up on the current session.
+
+
+def test_registry_gives_every_task_its_own_session(registry: SessionRegistry) -> None:
+    async def session_of_task() -> Session:
+        session = registry()
+        assert registry() is session
+        return session
+
+    async def main() -> list[Session]:
+        return await asyncio.gather(session_of_task(), session_of_task())
+
+    first, second = asyncio.run(main())
+    assert first is not second
+    assert registry() not in (first, second)
+
+
+def test_models_write_through_sessions_of_their_thread(registry: SessionRegistry) -> None:
+    def write(text: str) -> int | None:
+        note = Note(text=text)
+        note.add()
+        registry.remove()
+        return note.id
+
+    with ThreadPoolExecutor(4) as pool:
+        ids = list(pool.map(write, [str(number) for number in range(8)]))
+    assert sorted(note.text for note in Note.get_all()) == [str(number) for number in range(8)]
+    assert len(set(ids)) == 8
+
+
+def test_use_session_overrides_the_default(registry: SessionRegistry) -> None:
+    with Session(registry().get_bind()) as other, use_session(other):
+        assert registry() is other
+        Note(text="override").add()
+        assert Note.get_all()[0].text == "override"
+    assert registry() is not other
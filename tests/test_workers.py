@@ -1,9 +1,21 @@
 from __future__ import annotations
 
 import asyncio
+import multiprocessing
+import os
+import pickle
+import sys
+import threading
 import time
+from functools import partial
+from typing import TYPE_CHECKING
 
-from herogold.workers import AsyncWorkerPool, WorkerPool
+import pytest
+
+from herogold.workers import AsyncWorkerPool, MetricsRecorder, SharedBuffer, WorkerDiedError, WorkerPool
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 timeout = 1  # seconds
 
@@ -89,3 +101,325 @@ def test_async_workerpool_waits_for_completed_tasks() -> None:
             assert [i async for i in pool.pop_errors()] == []
 
     asyncio.run(run())
+
+
+def _square(value: int) -> int:
+    return value * value
+
+
+def test_workerpool_submit_returns_result_future() -> None:
+    with WorkerPool() as pool:
+        future = pool.submit(partial(_square, 7))
+        assert future.result(timeout=timeout) == 49
+
+
+def test_workerpool_submit_future_carries_exception() -> None:
+    with WorkerPool() as pool:
+        future = pool.submit(_raise_zero_division)
+        pool.wait()
+
+        assert isinstance(future.exception(timeout=timeout), ZeroDivisionError)
+        assert len(list(pool.pop_errors())) == 1
+
+
+def test_workerpool_submit_many_keeps_order_across_chunks() -> None:
+    with WorkerPool(size=2) as pool:
+        futures = pool.submit_many((partial(_square, i) for i in range(25)), chunksize=4)
+        pool.wait()
+
+        assert [f.result() for f in futures] == [i * i for i in range(25)]
+
+
+def test_workerpool_submit_many_rejects_invalid_chunksize() -> None:
+    with WorkerPool() as pool, pytest.raises(ValueError, match="chunksize"):
+        pool.submit_many([no_op], chunksize=0)
+
+
+def test_async_workerpool_submit_many_results() -> None:
+    async def run() -> None:
+        async with AsyncWorkerPool(size=2) as pool:
+            futures = await pool.submit_many([partial(_square, i) for i in range(10)])
+            results = await asyncio.wait_for(asyncio.gather(*futures), timeout=timeout)
+
+            assert results == [i * i for i in range(10)]
+
+    asyncio.run(run())
+
+
+def _sum_shared(buffer: SharedBuffer) -> int:
+    with buffer.open() as view:
+        return sum(view)
+
+
+def _fill_shared(buffer: SharedBuffer, value: int) -> None:
+    with buffer.open() as view:
+        view[:] = bytes([value]) * buffer.size
+
+
+def test_workerpool_shares_buffer_with_workers() -> None:
+    with WorkerPool() as pool:
+        shared = pool.share(bytes(range(10)))
+        assert pool.submit(partial(_sum_shared, shared)).result(timeout=timeout) == sum(range(10))
+
+
+def test_workerpool_workers_write_into_allocated_buffer() -> None:
+    with WorkerPool() as pool:
+        shared = pool.allocate(4)
+        pool.submit(partial(_fill_shared, shared, 7)).result(timeout=timeout)
+        assert shared.read() == bytes([7, 7, 7, 7])
+
+
+def test_workerpool_unlinks_shared_buffers_on_close() -> None:
+    with WorkerPool() as pool:
+        released = pool.share(b"early")
+        kept = pool.share(b"late")
+        pool.release(released)
+        with pytest.raises(FileNotFoundError):
+            released.read()
+        assert kept.read() == b"late"
+
+    with pytest.raises(FileNotFoundError):
+        kept.read()
+
+
+def test_async_workerpool_submit_returns_awaitable_result() -> None:
+    async def run() -> None:
+        async with AsyncWorkerPool() as pool:
+            future = await pool.submit(partial(_square, 6))
+            assert await asyncio.wait_for(future, timeout=timeout) == 36
+
+    asyncio.run(run())
+
+
+def test_async_workerpool_streams_results() -> None:
+    async def run() -> None:
+        async with AsyncWorkerPool(size=2) as pool:
+            await pool.submit_many([partial(_square, i) for i in range(8)], chunksize=3)
+            await pool.submit(_raise_zero_division)
+
+            # Iterated directly, so the stream is registered before any result reaches the loop.
+            results = [i async for i in pool.results()]
+            assert sorted(results) == [i * i for i in range(8)]
+            assert len([i async for i in pool.pop_errors()]) == 1
+
+    asyncio.run(run())
+
+
+def test_async_workerpool_results_ends_without_pending_tasks() -> None:
+    async def run() -> None:
+        async with AsyncWorkerPool() as pool:
+            assert [i async for i in pool.results()] == []
+
+    asyncio.run(run())
+
+
+def _now() -> float:
+    return time.monotonic()
+
+
+def _sleep_short() -> None:
+    time.sleep(0.3)
+
+
+def test_workerpool_runs_urgent_tasks_first() -> None:
+    with WorkerPool() as pool:
+        pool.submit(_sleep_short)
+        pool.submit(no_op)  # Fills the worker's prefetch, so the next tasks wait in the parent.
+        low = pool.submit(_now)
+        urgent = pool.submit(_now, priority=10)
+
+        assert urgent.result(timeout=timeout) < low.result(timeout=timeout)
+
+
+def test_workerpool_stealing_scheduler_runs_all_tasks() -> None:
+    with WorkerPool(size=2, scheduler="stealing") as pool:
+        futures = pool.submit_many([partial(_square, i) for i in range(20)], chunksize=1)
+        pool.wait()
+
+        assert [f.result() for f in futures] == [i * i for i in range(20)]
+
+
+def _pid() -> int:
+    return os.getpid()
+
+
+def _exit_abruptly() -> None:
+    os._exit(3)
+
+
+def test_workerpool_recycles_workers_after_max_tasks() -> None:
+    with WorkerPool(max_tasks_per_worker=2) as pool:
+        futures = pool.submit_many([_pid] * 6, chunksize=1)
+        pool.wait()
+
+        assert len({f.result() for f in futures}) == 3
+        [stats] = pool.stats()
+        assert stats.tasks_done == 6
+        assert stats.crashes == 0
+
+
+def test_workerpool_recycles_workers_over_memory_limit() -> None:
+    with WorkerPool(max_memory_per_worker=1) as pool:
+        first = pool.submit(_pid).result(timeout=timeout)
+        second = pool.submit(_pid).result(timeout=timeout * 5)
+
+        assert first != second
+
+
+def test_workerpool_replaces_crashed_worker() -> None:
+    with WorkerPool() as pool:
+        lost = pool.submit(_exit_abruptly)
+        with pytest.raises(WorkerDiedError, match="exit code 3"):
+            lost.result(timeout=timeout * 5)
+
+        assert pool.submit(partial(_square, 3)).result(timeout=timeout * 5) == 9
+        [stats] = pool.stats()
+        assert stats.crashes == 1
+        assert stats.restarts == 1
+        assert stats.alive
+
+
+def test_workerpool_stats_track_busy_time_and_memory() -> None:
+    with WorkerPool(size=2) as pool:
+        pool.submit(_sleep_short).result(timeout=timeout)
+        stats = pool.stats()
+
+        assert [s.slot for s in stats] == [0, 1]
+        assert sum(s.tasks_done for s in stats) == 1
+        assert sum(s.busy_seconds for s in stats) >= 0.3
+        assert max(s.rss for s in stats) > 0
+
+
+def _alive_workers(pool: WorkerPool) -> int:
+    return sum(s.alive for s in pool.stats())
+
+
+def _wait_until(condition: Callable[[], bool], seconds: float) -> bool:
+    deadline = time.monotonic() + seconds
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+def test_workerpool_autoscales_with_backlog() -> None:
+    with WorkerPool(size=1, max_size=3, idle_timeout=0.5) as pool:
+        futures = pool.submit_many([_sleep_short] * 12, chunksize=1)
+
+        assert _wait_until(lambda: _alive_workers(pool) == 3, seconds=5)
+        pool.wait()
+        assert all(f.exception() is None for f in futures)
+
+        assert _wait_until(lambda: _alive_workers(pool) == 1, seconds=5)
+        assert pool.size == 1
+
+
+def _return_lock() -> threading.Lock:
+    return threading.Lock()
+
+
+def _raise_with_lock() -> None:
+    raise ValueError(threading.Lock())
+
+
+def test_workerpool_fails_unpicklable_return_value() -> None:
+    with WorkerPool() as pool:
+        futures = pool.submit_many([_return_lock, partial(_square, 2)], chunksize=2)
+        pool.wait()
+
+        with pytest.raises(pickle.PicklingError, match="task 0"):
+            futures[0].result(timeout=timeout)
+        assert futures[1].result(timeout=timeout) == 4
+
+
+def test_workerpool_fails_unpicklable_exception() -> None:
+    with WorkerPool() as pool:
+        failed = pool.submit(_raise_with_lock)
+        with pytest.raises(pickle.PicklingError, match="ValueError"):
+            failed.result(timeout=timeout * 5)
+
+        assert pool.submit(partial(_square, 3)).result(timeout=timeout * 5) == 9
+        assert [type(error) for error in pool.pop_errors()] == [pickle.PicklingError]
+
+
+def test_workerpool_rejects_invalid_autoscale_bounds() -> None:
+    with pytest.raises(ValueError, match="min_size"):
+        WorkerPool(size=4, max_size=2)
+    with pytest.raises(ValueError, match="shared scheduler"):
+        WorkerPool(size=2, max_size=4, scheduler="stealing")
+
+
+def test_thread_backend_runs_unpicklable_actions() -> None:
+    with WorkerPool(size=2, backend="thread") as pool:
+        futures = pool.submit_many([lambda i=i: i * i for i in range(10)], chunksize=3)
+        pool.wait()
+
+        assert [f.result() for f in futures] == [i * i for i in range(10)]
+        assert {s.pid for s in pool.stats()} == {os.getpid()}
+
+
+def test_thread_backend_recycles_and_steals() -> None:
+    with WorkerPool(size=2, backend="thread", scheduler="stealing", max_tasks_per_worker=3) as pool:
+        futures = pool.submit_many([partial(_square, i) for i in range(12)], chunksize=1)
+        pool.wait()
+
+        assert [f.result() for f in futures] == [i * i for i in range(12)]
+        assert sum(s.tasks_done for s in pool.stats()) == 12
+
+
+def test_async_workerpool_thread_backend() -> None:
+    async def run() -> None:
+        async with AsyncWorkerPool(backend="thread") as pool:
+            future = await pool.submit(lambda: "done")
+            assert await asyncio.wait_for(future, timeout=timeout) == "done"
+
+    asyncio.run(run())
+
+
+def test_context_requires_process_backend() -> None:
+    with pytest.raises(ValueError, match="thread backend"):
+        WorkerPool(ctx=multiprocessing.get_context("spawn"), backend="thread")
+
+
+@pytest.mark.skipif(sys.version_info >= (3, 14), reason="Subinterpreters are available.")
+def test_interpreter_backend_needs_python_314() -> None:
+    with pytest.raises(RuntimeError, match=r"3\.14"):
+        WorkerPool(backend="interpreter")
+
+
+@pytest.mark.skipif(sys.version_info < (3, 14), reason="Subinterpreters need Python 3.14.")
+def test_interpreter_backend_runs_actions() -> None:
+    with WorkerPool(size=2, backend="interpreter") as pool:
+        futures = pool.submit_many([partial(_square, i) for i in range(6)], chunksize=2)
+        pool.wait()
+
+        assert [f.result() for f in futures] == [i * i for i in range(6)]
+
+
+def test_workerpool_reports_task_metrics() -> None:
+    recorder = MetricsRecorder()
+    with WorkerPool(size=2, on_task=recorder) as pool:
+        pool.submit_many([partial(_square, i) for i in range(8)], chunksize=3)
+        pool.submit(_raise_zero_division)
+        pool.wait()
+
+    assert sorted(m.task_id for m in recorder.records) == list(range(9))
+    for metrics in recorder.records:
+        assert metrics.enqueued <= metrics.started <= metrics.finished
+        assert metrics.payload_bytes
+        assert metrics.result_bytes
+    summary = recorder.summary()
+    assert summary["tasks"] == 9
+    assert summary["failed"] == 1
+
+
+def test_thread_backend_metrics_skip_unpicklable_payloads() -> None:
+    recorder = MetricsRecorder()
+    with WorkerPool(backend="thread", on_task=recorder) as pool:
+        pool.submit(lambda: 1)
+        pool.wait()
+
+    [metrics] = recorder.records
+    assert metrics.payload_bytes is None
+    assert metrics.succeeded
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from queue import Queue
+
+from herogold.workers.scheduler import Dispatcher, next_batch
+
+timeout = 1  # seconds
+
+
+def test_next_batch_prefers_own_queue() -> None:
+    queues: list[Queue[str | None]] = [Queue(), Queue()]
+    queues[0].put("own")
+    queues[1].put("other")
+
+    assert next_batch(0, queues) == (0, "own")
+
+
+def test_next_batch_steals_when_own_queue_is_empty() -> None:
+    queues: list[Queue[str | None]] = [Queue(), Queue()]
+    queues[1].put("other")
+
+    assert next_batch(0, queues) == (1, "other")
+
+
+def test_next_batch_leaves_exit_signal_for_owner() -> None:
+    queues: list[Queue[str | None]] = [Queue(), Queue()]
+    queues[1].put(None)
+    queues[1].put("other")
+
+    assert next_batch(0, queues) == (1, "other")
+    assert queues[1].get_nowait() is None
+
+
+def test_dispatcher_sends_highest_priority_first() -> None:
+    queue: Queue[str | None] = Queue()
+    dispatcher = Dispatcher([queue], capacity=1)
+    dispatcher.push("low")
+    dispatcher.push("urgent", priority=5)
+    dispatcher.push("normal", priority=1)
+    dispatcher.start()
+
+    sent = []
+    for _ in range(3):
+        sent.append(queue.get(timeout=timeout))
+        assert queue.empty()  # Capacity of one, the next batch waits until this one is done.
+        dispatcher.done(0)
+    dispatcher.stop()
+
+    assert sent == ["urgent", "normal", "low"]
+    assert dispatcher.backlog == 0
+    assert dispatcher.outstanding == 0
+
+
+def test_dispatcher_discards_unsent_batches() -> None:
+    queue: Queue[str | None] = Queue()
+    dispatcher = Dispatcher([queue], capacity=1)
+    dispatcher.start()
+    dispatcher.push("sent")
+    dispatcher.push("waiting")
+    assert queue.get(timeout=timeout) == "sent"
+
+    assert dispatcher.stop(discard=True) == ["waiting"]